@@ -1,5 +1,7 @@
 #include "emoji_img.h"
 
+#include <stdint.h>
+
 #include <stdlib.h>
 
 #include <string.h>
@@ -19,9 +21,159 @@ void parse_color(const char* color_str, double* r, double* g, double* b) {
     else { *r=0; *g=0; *b=0; } // default black
 }
 
+static char* copy_string(const char* str) {
+    size_t len = strlen(str) + 1;
+    char* copy = malloc(len);
+    memcpy(copy, str, len);
+    return copy;
+}
+
+// Shaped layout cache.
+// Layouts are bound to the calling thread's font map, so the cache is per thread.
+// Entries are reused across images (e.g. animation frames) and live until the
+// slot is recycled; a worker thread keeps its cache warm between calls. When
+// the thread exits the cache is freed, which releases the layouts and with
+// them the thread's font map.
+#define LAYOUT_CACHE_SIZE 32
+
+typedef struct {
+    char *text;
+    int markup;
+    char *font_family;
+    double font_size;
+    PangoLayout *layout;
+} LayoutCacheEntry;
+
+typedef struct {
+    LayoutCacheEntry entries[LAYOUT_CACHE_SIZE];
+    int next;
+} LayoutCache;
+
+static void free_layout_cache(gpointer data) {
+    LayoutCache *cache = data;
+    for (int i = 0; i < LAYOUT_CACHE_SIZE; i++) {
+        LayoutCacheEntry *entry = &cache->entries[i];
+        if (entry->layout) {
+            g_object_unref(entry->layout);
+            free(entry->text);
+            free(entry->font_family);
+        }
+    }
+    free(cache);
+}
+
+static GPrivate layout_cache_key = G_PRIVATE_INIT(free_layout_cache);
+
+static LayoutCache* thread_layout_cache(void) {
+    LayoutCache *cache = g_private_get(&layout_cache_key);
+    if (cache == NULL) {
+        cache = calloc(1, sizeof(LayoutCache));
+        g_private_set(&layout_cache_key, cache);
+    }
+    return cache;
+}
+
+// Pango markup becomes one PangoAttrList over the plain text, so styled runs
+// are shaped and drawn by a single layout. Returns 0 if the markup is invalid.
+static int set_layout_text(PangoLayout *layout, const char* text, int markup) {
+    if (markup) {
+        PangoAttrList *attrs = NULL;
+        char *plain = NULL;
+        if (!pango_parse_markup(text, -1, 0, &attrs, &plain, NULL, NULL)) {
+            return 0;
+        }
+        pango_layout_set_text(layout, plain, -1);
+        pango_layout_set_attributes(layout, attrs);
+        pango_attr_list_unref(attrs);
+        g_free(plain);
+        return 1;
+    }
+    pango_layout_set_text(layout, text, -1);
+    return 1;
+}
+
+// Returns a layout for text ready to draw on cr, or NULL if the markup is invalid.
+// The cache owns it: do not unref.
+static PangoLayout* get_layout(cairo_t *cr, const char* text, int markup, const char* font_family, double font_size) {
+    LayoutCache *cache = thread_layout_cache();
+    for (int i = 0; i < LAYOUT_CACHE_SIZE; i++) {
+        LayoutCacheEntry *entry = &cache->entries[i];
+        if (entry->layout && entry->font_size == font_size && entry->markup == markup &&
+            strcmp(entry->text, text) == 0 && strcmp(entry->font_family, font_family) == 0) {
+            // Keeps the shaped lines unless the target's font options or matrix changed
+            pango_cairo_update_layout(cr, entry->layout);
+            return entry->layout;
+        }
+    }
+
+    PangoLayout *layout = pango_cairo_create_layout(cr);
+    if (!set_layout_text(layout, text, markup)) {
+        // Nothing is cached, so the error is reported on every draw
+        g_object_unref(layout);
+        return NULL;
+    }
+
+    LayoutCacheEntry *entry = &cache->entries[cache->next];
+    cache->next = (cache->next + 1) % LAYOUT_CACHE_SIZE;
+    if (entry->layout) {
+        g_object_unref(entry->layout);
+        free(entry->text);
+        free(entry->font_family);
+    }
+
+    PangoFontDescription *desc = pango_font_description_from_string(font_family);
+    pango_font_description_set_size(desc, font_size * PANGO_SCALE);
+    pango_layout_set_font_description(layout, desc);
+    pango_font_description_free(desc);
+
+    entry->text = copy_string(text);
+    entry->markup = markup;
+    entry->font_family = copy_string(font_family);
+    entry->font_size = font_size;
+    entry->layout = layout;
+    return layout;
+}
+
 EmojiImageManipulator* emoji_img_create(const char* image_path) {
     // Load image using Cairo (simplified, assume PNG)
     cairo_surface_t *image_surface = cairo_image_surface_create_from_png(image_path);
+    if (cairo_surface_status(image_surface) != CAIRO_STATUS_SUCCESS) {
+        cairo_surface_destroy(image_surface);
+        return NULL;
+    }
+
+    cairo_t *cr = cairo_create(image_surface);
+
+    EmojiImageManipulator* manip = malloc(sizeof(EmojiImageManipulator));
+    manip->surface = image_surface;
+    manip->cr = cr;
+    return manip;
+}
+
+typedef struct {
+    const unsigned char *data;
+    size_t length;
+    size_t offset;
+} PngReader;
+
+static cairo_status_t read_png_data(void *closure, unsigned char *out, unsigned int length) {
+    PngReader *reader = closure;
+    if (reader->length - reader->offset < length) {
+        return CAIRO_STATUS_READ_ERROR;
+    }
+    memcpy(out, reader->data + reader->offset, length);
+    reader->offset += length;
+    return CAIRO_STATUS_SUCCESS;
+}
+
+EmojiImageManipulator* emoji_img_create_from_png_data(const unsigned char* data, size_t length) {
+    PngReader reader = {data, length, 0};
+    cairo_surface_t *image_surface = cairo_image_surface_create_from_png_stream(read_png_data, &reader);
+    if (cairo_surface_status(image_surface) != CAIRO_STATUS_SUCCESS) {
+        cairo_surface_destroy(image_surface);
+        return NULL;
+    }
+
     cairo_t *cr = cairo_create(image_surface);
 
     EmojiImageManipulator* manip = malloc(sizeof(EmojiImageManipulator));
@@ -51,6 +203,28 @@ EmojiImageManipulator* emoji_img_create_from_data(unsigned char* data, int width
     return manip;
 }
 
+EmojiImageManipulator* emoji_img_create_for_data(unsigned char* data, int format, int width, int height, int stride) {
+    // Draw directly on caller-owned memory (e.g. a memory-mapped file); the caller keeps it alive
+    cairo_surface_t *image_surface = cairo_image_surface_create_for_data(
+        data,
+        (cairo_format_t)format,
+        width,
+        height,
+        stride
+    );
+    if (cairo_surface_status(image_surface) != CAIRO_STATUS_SUCCESS) {
+        cairo_surface_destroy(image_surface);
+        return NULL;
+    }
+
+    cairo_t *cr = cairo_create(image_surface);
+
+    EmojiImageManipulator* manip = malloc(sizeof(EmojiImageManipulator));
+    manip->surface = image_surface;
+    manip->cr = cr;
+    return manip;
+}
+
 EmojiImageManipulator* emoji_img_create_empty(int width, int height) {
     cairo_surface_t *image_surface = cairo_image_surface_create(CAIRO_FORMAT_ARGB32, width, height);
     cairo_t *cr = cairo_create(image_surface);
@@ -69,172 +243,358 @@ void emoji_img_add_text(EmojiImageManipulator* manip, const char* text, double x
 
     cairo_set_source_rgb(manip->cr, r, g, b);
 
-    PangoLayout *layout = pango_cairo_create_layout(manip->cr);
-
-    pango_layout_set_text(layout, text, -1);
-
-    PangoFontDescription *desc = pango_font_description_from_string(font_family);
-
-    pango_font_description_set_size(desc, font_size * PANGO_SCALE);
-
-    pango_layout_set_font_description(layout, desc);
+    PangoLayout *layout = get_layout(manip->cr, text, 0, font_family, font_size);
 
     cairo_move_to(manip->cr, x, y);
 
     pango_cairo_show_layout(manip->cr, layout);
 
-    g_object_unref(layout);
+}
 
-    pango_font_description_free(desc);
+// Colors of an EmojiTextStyle, parsed once per draw or batch
+typedef struct {
+    double fill[3];
+    double gradient1[3];
+    double gradient2[3];
+    double shadow[3];
+    double outline[3];
+    double background[3];
+    double border[3];
+} StyleColors;
+
+static void parse_style_colors(const EmojiTextStyle* style, StyleColors* colors) {
+    parse_color(style->color, &colors->fill[0], &colors->fill[1], &colors->fill[2]);
+    if (style->gradient_color1) {
+        const char *color2 = style->gradient_color2 ? style->gradient_color2 : style->gradient_color1;
+        parse_color(style->gradient_color1, &colors->gradient1[0], &colors->gradient1[1], &colors->gradient1[2]);
+        parse_color(color2, &colors->gradient2[0], &colors->gradient2[1], &colors->gradient2[2]);
+    }
+    if (style->has_shadow) {
+        parse_color(style->shadow_color ? style->shadow_color : "gray", &colors->shadow[0], &colors->shadow[1], &colors->shadow[2]);
+    }
+    if (style->outline_color) {
+        parse_color(style->outline_color, &colors->outline[0], &colors->outline[1], &colors->outline[2]);
+    }
+    if (style->background) {
+        parse_color(style->background, &colors->background[0], &colors->background[1], &colors->background[2]);
+    }
+    if (style->border_color) {
+        parse_color(style->border_color, &colors->border[0], &colors->border[1], &colors->border[2]);
+    }
+}
 
+// Only a solid fill: consecutive draws can share one source
+static int is_plain_style(const EmojiTextStyle* style) {
+    return !style->background && !style->has_shadow && !style->gradient_color1 &&
+           !(style->outline_color && style->outline_width > 0);
 }
 
-// Text with outline
-void emoji_img_add_text_outlined(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* fill_color, const char* outline_color, double outline_width) {
-    double fr, fg, fb, or, og, ob;
-    parse_color(fill_color, &fr, &fg, &fb);
-    parse_color(outline_color, &or, &og, &ob);
+// All effects in one pass from a single shaped layout
+static void draw_styled(cairo_t *cr, const EmojiTextStyle* style, const StyleColors* colors, PangoLayout *layout, double x, double y) {
+    double width = 0, height = 0;
+    if (style->background || style->gradient_color1) {
+        PangoRectangle logical_rect;
+        pango_layout_get_extents(layout, NULL, &logical_rect);
+        width = logical_rect.width / (double)PANGO_SCALE;
+        height = logical_rect.height / (double)PANGO_SCALE;
+    }
 
-    PangoLayout *layout = pango_cairo_create_layout(manip->cr);
-    pango_layout_set_text(layout, text, -1);
+    // Box
+    if (style->background) {
+        double padding = style->padding;
+        cairo_set_source_rgb(cr, colors->background[0], colors->background[1], colors->background[2]);
+        cairo_rectangle(cr, x - padding, y - padding, width + 2*padding, height + 2*padding);
+        cairo_fill(cr);
+
+        if (style->border_width > 0 && style->border_color) {
+            cairo_set_source_rgb(cr, colors->border[0], colors->border[1], colors->border[2]);
+            cairo_set_line_width(cr, style->border_width);
+            cairo_rectangle(cr, x - padding, y - padding, width + 2*padding, height + 2*padding);
+            cairo_stroke(cr);
+        }
+    }
 
-    PangoFontDescription *desc = pango_font_description_from_string(font_family);
-    pango_font_description_set_size(desc, font_size * PANGO_SCALE);
-    pango_layout_set_font_description(layout, desc);
+    // Shadow: the glyphs drawn at the offset become a mask for the shadow
+    // color, so color emoji (which have no outline path) cast a shadow too
+    if (style->has_shadow) {
+        PangoRectangle ink_rect;
+        pango_layout_get_pixel_extents(layout, &ink_rect, NULL);
+        double sx = x + style->shadow_x;
+        double sy = y + style->shadow_y;
+
+        cairo_save(cr);
+        // Keeps the group surface as small as the shadow
+        cairo_rectangle(cr, sx + ink_rect.x - 1, sy + ink_rect.y - 1, ink_rect.width + 2, ink_rect.height + 2);
+        cairo_clip(cr);
+        cairo_push_group(cr);
+        cairo_move_to(cr, sx, sy);
+        pango_cairo_show_layout(cr, layout);
+        cairo_pattern_t *mask = cairo_pop_group(cr);
+        cairo_set_source_rgba(cr, colors->shadow[0], colors->shadow[1], colors->shadow[2], style->shadow_opacity);
+        cairo_mask(cr, mask);
+        cairo_pattern_destroy(mask);
+        cairo_restore(cr);
+    }
+
+    // Outline: the stroke is centered on the edge, the fill covers its inner half.
+    // Color (bitmap) emoji glyphs have no outline path, so they are not outlined.
+    if (style->outline_color && style->outline_width > 0) {
+        cairo_save(cr);
+        cairo_new_path(cr);
+        cairo_move_to(cr, x, y);
+        pango_cairo_layout_path(cr, layout);
+        cairo_set_source_rgb(cr, colors->outline[0], colors->outline[1], colors->outline[2]);
+        cairo_set_line_width(cr, style->outline_width * 2);
+        cairo_set_line_join(cr, CAIRO_LINE_JOIN_ROUND);
+        cairo_stroke(cr);
+        cairo_restore(cr);
+    }
 
-    // Draw outline by drawing text multiple times with offsets
-    cairo_set_source_rgb(manip->cr, or, og, ob);
-    for (int dx = -1; dx <= 1; dx++) {
-        for (int dy = -1; dy <= 1; dy++) {
-            if (dx == 0 && dy == 0) continue; // Skip center
-            cairo_move_to(manip->cr, x + dx * outline_width, y + dy * outline_width);
-            pango_cairo_show_layout(manip->cr, layout);
+    // Fill
+    cairo_pattern_t *pattern = NULL;
+    if (style->gradient_color1) {
+        if (style->gradient_vertical) {
+            pattern = cairo_pattern_create_linear(0, y, 0, y + height);
+        } else {
+            pattern = cairo_pattern_create_linear(x, 0, x + width, 0);
         }
+        cairo_pattern_add_color_stop_rgb(pattern, 0, colors->gradient1[0], colors->gradient1[1], colors->gradient1[2]);
+        cairo_pattern_add_color_stop_rgb(pattern, 1, colors->gradient2[0], colors->gradient2[1], colors->gradient2[2]);
+        cairo_set_source(cr, pattern);
+    } else {
+        cairo_set_source_rgb(cr, colors->fill[0], colors->fill[1], colors->fill[2]);
     }
 
-    // Draw fill text
-    cairo_set_source_rgb(manip->cr, fr, fg, fb);
-    cairo_move_to(manip->cr, x, y);
-    pango_cairo_show_layout(manip->cr, layout);
+    cairo_move_to(cr, x, y);
+    pango_cairo_show_layout(cr, layout);
 
-    g_object_unref(layout);
-    pango_font_description_free(desc);
+    if (pattern) {
+        cairo_pattern_destroy(pattern);
+    }
 }
 
-// Text with gradient
-void emoji_img_add_text_gradient(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* color1, const char* color2, int vertical) {
-    double r1, g1, b1, r2, g2, b2;
-    parse_color(color1, &r1, &g1, &b1);
-    parse_color(color2, &r2, &g2, &b2);
+int emoji_img_draw_text(EmojiImageManipulator* manip, const EmojiTextStyle* style, const char* text, double x, double y) {
+    PangoLayout *layout = get_layout(manip->cr, text, style->markup, style->font_family, style->font_size);
+    if (layout == NULL) {
+        return EMOJI_IMG_INVALID_MARKUP;
+    }
+    StyleColors colors;
+    parse_style_colors(style, &colors);
+    draw_styled(manip->cr, style, &colors, layout, x, y);
+    return 0;
+}
 
-    PangoLayout *layout = pango_cairo_create_layout(manip->cr);
-    pango_layout_set_text(layout, text, -1);
-    
-    PangoFontDescription *desc = pango_font_description_from_string(font_family);
-    pango_font_description_set_size(desc, font_size * PANGO_SCALE);
-    pango_layout_set_font_description(layout, desc);
+static void grow_rect(double* rect, double x0, double y0, double x1, double y1) {
+    if (x0 < rect[0]) rect[0] = x0;
+    if (y0 < rect[1]) rect[1] = y0;
+    if (x1 > rect[2]) rect[2] = x1;
+    if (y1 > rect[3]) rect[3] = y1;
+}
 
-    // Get text extents for gradient
+static void measure_layout(const EmojiTextStyle* style, PangoLayout *layout, double x, double y, double* extents) {
     PangoRectangle ink_rect, logical_rect;
     pango_layout_get_extents(layout, &ink_rect, &logical_rect);
-    double width = logical_rect.width / (double)PANGO_SCALE;
-    double height = logical_rect.height / (double)PANGO_SCALE;
 
-    // Create gradient pattern
-    cairo_pattern_t *pattern;
-    if (vertical) {
-        pattern = cairo_pattern_create_linear(0, y, 0, y + height);
-    } else {
-        pattern = cairo_pattern_create_linear(x, 0, x + width, 0);
+    double *ink = extents;
+    double *cover = extents + 4;
+    ink[0] = ink[1] = 1e300;
+    ink[2] = ink[3] = -1e300;
+    cover[0] = cover[1] = cover[2] = cover[3] = 0;
+
+    if (ink_rect.width > 0 && ink_rect.height > 0) {
+        double gx0 = x + ink_rect.x / (double)PANGO_SCALE;
+        double gy0 = y + ink_rect.y / (double)PANGO_SCALE;
+        double gx1 = gx0 + ink_rect.width / (double)PANGO_SCALE;
+        double gy1 = gy0 + ink_rect.height / (double)PANGO_SCALE;
+
+        double grow = (style->outline_color && style->outline_width > 0) ? style->outline_width : 0;
+        grow_rect(ink, gx0 - grow, gy0 - grow, gx1 + grow, gy1 + grow);
+        if (style->has_shadow) {
+            grow_rect(ink, gx0 + style->shadow_x, gy0 + style->shadow_y, gx1 + style->shadow_x, gy1 + style->shadow_y);
+        }
     }
-    cairo_pattern_add_color_stop_rgb(pattern, 0, r1, g1, b1);
-    cairo_pattern_add_color_stop_rgb(pattern, 1, r2, g2, b2);
 
-    cairo_move_to(manip->cr, x, y);
-    cairo_set_source(manip->cr, pattern);
-    pango_cairo_show_layout(manip->cr, layout);
+    if (style->background) {
+        double padding = style->padding;
+        double bx0 = x - padding;
+        double by0 = y - padding;
+        double bx1 = x + logical_rect.width / (double)PANGO_SCALE + padding;
+        double by1 = y + logical_rect.height / (double)PANGO_SCALE + padding;
+        double half = (style->border_width > 0 && style->border_color) ? style->border_width / 2 : 0;
+        grow_rect(ink, bx0 - half, by0 - half, bx1 + half, by1 + half);
+
+        // The box interior is painted opaque
+        cover[0] = bx0;
+        cover[1] = by0;
+        cover[2] = bx1;
+        cover[3] = by1;
+    }
 
-    cairo_pattern_destroy(pattern);
-    g_object_unref(layout);
-    pango_font_description_free(desc);
-}
+    if (ink[0] > ink[2]) {
+        // Nothing is drawn
+        ink[0] = ink[2] = x;
+        ink[1] = ink[3] = y;
+        return;
+    }
 
-// Text with shadow
-void emoji_img_add_text_shadow(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* color, double shadow_x, double shadow_y, const char* shadow_color, double shadow_opacity) {
-    double r, g, b, sr, sg, sb;
-    parse_color(color, &r, &g, &b);
-    parse_color(shadow_color, &sr, &sg, &sb);
+    // Antialiasing can touch one more pixel on each side
+    ink[0] -= 1;
+    ink[1] -= 1;
+    ink[2] += 1;
+    ink[3] += 1;
+}
 
-    PangoLayout *layout = pango_cairo_create_layout(manip->cr);
-    pango_layout_set_text(layout, text, -1);
-    
-    PangoFontDescription *desc = pango_font_description_from_string(font_family);
-    pango_font_description_set_size(desc, font_size * PANGO_SCALE);
-    pango_layout_set_font_description(layout, desc);
+void* emoji_img_shape_text(EmojiImageManipulator* manip, const EmojiTextStyle* style, const char* text, double x, double y, double* extents) {
+    PangoLayout *layout = get_layout(manip->cr, text, style->markup, style->font_family, style->font_size);
+    if (layout == NULL) {
+        return NULL;
+    }
+    measure_layout(style, layout, x, y, extents);
+    // The caller's reference keeps it shaped even after the cache recycles its slot
+    g_object_ref(layout);
+    return layout;
+}
 
-    // Draw shadow
-    cairo_move_to(manip->cr, x + shadow_x, y + shadow_y);
-    cairo_set_source_rgba(manip->cr, sr, sg, sb, shadow_opacity);
-    pango_cairo_show_layout(manip->cr, layout);
+void emoji_img_draw_layouts(EmojiImageManipulator* manip, const EmojiTextStyle* style, void** layouts, const double* positions, int count) {
+    StyleColors colors;
+    parse_style_colors(style, &colors);
 
-    // Draw main text
-    cairo_move_to(manip->cr, x, y);
-    cairo_set_source_rgb(manip->cr, r, g, b);
-    pango_cairo_show_layout(manip->cr, layout);
+    if (!is_plain_style(style)) {
+        for (int i = 0; i < count; i++) {
+            pango_cairo_update_layout(manip->cr, layouts[i]);
+            draw_styled(manip->cr, style, &colors, layouts[i], positions[2*i], positions[2*i + 1]);
+        }
+        return;
+    }
 
-    g_object_unref(layout);
-    pango_font_description_free(desc);
+    // Solid fill only: set the source once for the whole batch
+    cairo_set_source_rgb(manip->cr, colors.fill[0], colors.fill[1], colors.fill[2]);
+    for (int i = 0; i < count; i++) {
+        pango_cairo_update_layout(manip->cr, layouts[i]);
+        cairo_move_to(manip->cr, positions[2*i], positions[2*i + 1]);
+        pango_cairo_show_layout(manip->cr, layouts[i]);
+    }
 }
 
-// TextBox with background and border
-void emoji_img_add_textbox(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* text_color, const char* bg_color, double padding, const char* border_color, double border_width) {
-    double tr, tg, tb, br, bg, bb, bdr, bdg, bdb;
-    parse_color(text_color, &tr, &tg, &tb);
-    parse_color(bg_color, &br, &bg, &bb);
-    parse_color(border_color, &bdr, &bdg, &bdb);
-
-    PangoLayout *layout = pango_cairo_create_layout(manip->cr);
-    pango_layout_set_text(layout, text, -1);
-    
-    PangoFontDescription *desc = pango_font_description_from_string(font_family);
-    pango_font_description_set_size(desc, font_size * PANGO_SCALE);
-    pango_layout_set_font_description(layout, desc);
+void emoji_img_release_layout(void* layout) {
+    if (layout) {
+        g_object_unref(layout);
+    }
+}
 
-    // Get text extents
-    PangoRectangle ink_rect, logical_rect;
-    pango_layout_get_extents(layout, &ink_rect, &logical_rect);
-    double width = logical_rect.width / (double)PANGO_SCALE;
-    double height = logical_rect.height / (double)PANGO_SCALE;
+int emoji_img_save(EmojiImageManipulator* manip, const char* output_path) {
+    return cairo_surface_write_to_png(manip->surface, output_path);
+}
 
-    // Draw background
-    cairo_set_source_rgb(manip->cr, br, bg, bb);
-    cairo_rectangle(manip->cr, x - padding, y - padding, width + 2*padding, height + 2*padding);
-    cairo_fill(manip->cr);
+typedef struct {
+    unsigned char *data;
+    size_t length;
+    size_t capacity;
+} PngWriter;
+
+static cairo_status_t write_png_data(void *closure, const unsigned char *data, unsigned int length) {
+    PngWriter *writer = closure;
+    if (writer->length + length > writer->capacity) {
+        size_t capacity = writer->capacity ? writer->capacity : 65536;
+        while (capacity < writer->length + length) {
+            capacity *= 2;
+        }
+        unsigned char *grown = realloc(writer->data, capacity);
+        if (grown == NULL) {
+            return CAIRO_STATUS_NO_MEMORY;
+        }
+        writer->data = grown;
+        writer->capacity = capacity;
+    }
+    memcpy(writer->data + writer->length, data, length);
+    writer->length += length;
+    return CAIRO_STATUS_SUCCESS;
+}
 
-    // Draw border
-    if (border_width > 0) {
-        cairo_set_source_rgb(manip->cr, bdr, bdg, bdb);
-        cairo_set_line_width(manip->cr, border_width);
-        cairo_rectangle(manip->cr, x - padding, y - padding, width + 2*padding, height + 2*padding);
-        cairo_stroke(manip->cr);
+int emoji_img_encode_png(EmojiImageManipulator* manip, unsigned char** out, size_t* length) {
+    PngWriter writer = {NULL, 0, 0};
+    if (cairo_surface_write_to_png_stream(manip->surface, write_png_data, &writer) != CAIRO_STATUS_SUCCESS) {
+        free(writer.data);
+        *out = NULL;
+        *length = 0;
+        return -1;
     }
+    *out = writer.data;
+    *length = writer.length;
+    return 0;
+}
 
-    // Draw text
-    cairo_move_to(manip->cr, x, y);
-    cairo_set_source_rgb(manip->cr, tr, tg, tb);
-    pango_cairo_show_layout(manip->cr, layout);
+void emoji_img_free(void* ptr) {
+    free(ptr);
+}
 
-    g_object_unref(layout);
-    pango_font_description_free(desc);
+void emoji_img_flush(EmojiImageManipulator* manip) {
+    cairo_surface_flush(manip->surface);
 }
 
-// Removed emoji_img_add_textbox as requested
+EmojiImageManipulator* emoji_img_copy(EmojiImageManipulator* manip) {
+    cairo_surface_flush(manip->surface);
+    int width = cairo_image_surface_get_width(manip->surface);
+    int height = cairo_image_surface_get_height(manip->surface);
 
+    cairo_surface_t *image_surface = cairo_image_surface_create(CAIRO_FORMAT_ARGB32, width, height);
+    cairo_t *cr = cairo_create(image_surface);
 
-void emoji_img_save(EmojiImageManipulator* manip, const char* output_path) {
+    cairo_set_operator(cr, CAIRO_OPERATOR_SOURCE);
+    cairo_set_source_surface(cr, manip->surface, 0, 0);
+    cairo_paint(cr);
+    cairo_set_operator(cr, CAIRO_OPERATOR_OVER);
 
-    cairo_surface_write_to_png(manip->surface, output_path);
+    EmojiImageManipulator* copy = malloc(sizeof(EmojiImageManipulator));
+    copy->surface = image_surface;
+    copy->cr = cr;
+    return copy;
+}
+
+int emoji_img_get_width(EmojiImageManipulator* manip) {
+    return cairo_image_surface_get_width(manip->surface);
+}
 
+int emoji_img_get_height(EmojiImageManipulator* manip) {
+    return cairo_image_surface_get_height(manip->surface);
+}
+
+// Write pixels as straight (non-premultiplied) RGBA, width * height * 4 bytes
+void emoji_img_export_rgba(EmojiImageManipulator* manip, unsigned char* out) {
+    cairo_surface_flush(manip->surface);
+    unsigned char *data = cairo_image_surface_get_data(manip->surface);
+    int width = cairo_image_surface_get_width(manip->surface);
+    int height = cairo_image_surface_get_height(manip->surface);
+    int stride = cairo_image_surface_get_stride(manip->surface);
+    int has_alpha = cairo_image_surface_get_format(manip->surface) == CAIRO_FORMAT_ARGB32;
+
+    for (int row = 0; row < height; row++) {
+        const uint32_t *src = (const uint32_t*)(data + row * stride);
+        for (int col = 0; col < width; col++) {
+            uint32_t pixel = src[col];
+            unsigned int a = has_alpha ? pixel >> 24 : 255;
+            unsigned int r = (pixel >> 16) & 0xff;
+            unsigned int g = (pixel >> 8) & 0xff;
+            unsigned int b = pixel & 0xff;
+            if (a == 0) {
+                r = g = b = 0;
+            } else if (a < 255) {
+                // Undo Cairo's premultiplied alpha
+                r = (r * 255 + a / 2) / a;
+                g = (g * 255 + a / 2) / a;
+                b = (b * 255 + a / 2) / a;
+                // Data handed in with straight alpha can exceed a
+                if (r > 255) r = 255;
+                if (g > 255) g = 255;
+                if (b > 255) b = 255;
+            }
+            out[0] = r;
+            out[1] = g;
+            out[2] = b;
+            out[3] = a;
+            out += 4;
+        }
+    }
 }
 
 void emoji_img_destroy(EmojiImageManipulator* manip) {
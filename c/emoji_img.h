@@ -16,8 +16,41 @@ typedef struct {
 
 } EmojiImageManipulator;
 
+// Full text style for emoji_img_draw_text. Every configured effect is drawn
+// in one pass; unset (NULL / zero) effects are skipped.
+typedef struct {
+    const char *font_family;
+    double font_size;
+    const char *color;
+    // Text is Pango markup: styled runs drawn in one layout
+    int markup;
+
+    // Shadow: filled glyph path at an offset (has_shadow != 0)
+    int has_shadow;
+    double shadow_x;
+    double shadow_y;
+    const char *shadow_color;
+    double shadow_opacity;
+
+    // Outline: glyph path stroked outline_width beyond the glyph edges
+    const char *outline_color;
+    double outline_width;
+
+    // Gradient fill, used instead of color when gradient_color1 is set
+    const char *gradient_color1;
+    const char *gradient_color2;
+    int gradient_vertical;
+
+    // Box behind the text (TextBox) when background is set
+    const char *background;
+    double padding;
+    const char *border_color;
+    double border_width;
+} EmojiTextStyle;
+
 // Functions
 
+// Load a PNG file. Returns NULL if it is missing or not a valid PNG.
 EmojiImageManipulator* emoji_img_create(const char* image_path);
 
 // New: Create from raw data (for Pillow/imgrs integration)
@@ -25,21 +58,58 @@ EmojiImageManipulator* emoji_img_create(const char* image_path);
 // Stride should be calculated by caller (usually width * 4 for ARGB32).
 EmojiImageManipulator* emoji_img_create_from_data(unsigned char* data, int width, int height, int stride);
 
+// Decode PNG bytes held in memory. Returns NULL if they are not a valid PNG.
+EmojiImageManipulator* emoji_img_create_from_png_data(const unsigned char* data, size_t length);
+
+// Create on caller-owned pixels in a given cairo_format_t (ARGB32 or RGB24).
+// Returns NULL if Cairo rejects the format/size/stride.
+EmojiImageManipulator* emoji_img_create_for_data(unsigned char* data, int format, int width, int height, int stride);
+
 // New: Create empty image (native Cairo surface)
 EmojiImageManipulator* emoji_img_create_empty(int width, int height);
 
 void emoji_img_add_text(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* color);
 
-// Advanced text functions
-void emoji_img_add_text_outlined(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* fill_color, const char* outline_color, double outline_width);
+// Status returned by emoji_img_draw_text when style->markup is set and the
+// text is not valid Pango markup (nothing is drawn)
+#define EMOJI_IMG_INVALID_MARKUP 1
+
+// Shape text once and draw box, shadow, outline, then gradient or solid fill.
+// Returns 0 on success.
+int emoji_img_draw_text(EmojiImageManipulator* manip, const EmojiTextStyle* style, const char* text, double x, double y);
+
+// Shape text for deferred drawing and return a handle to the layout, or NULL
+// for invalid markup. extents[0..3] receives the bounds of what drawing it at
+// x, y paints (x0, y0, x1, y1; x0 == x1 when nothing is drawn) and
+// extents[4..7] the opaque box interior (all zero without a background).
+// The handle stays valid until emoji_img_release_layout, on the same thread.
+void* emoji_img_shape_text(EmojiImageManipulator* manip, const EmojiTextStyle* style, const char* text, double x, double y, double* extents);
+
+// Draw count shaped layouts in one style; positions holds x, y pairs
+void emoji_img_draw_layouts(EmojiImageManipulator* manip, const EmojiTextStyle* style, void** layouts, const double* positions, int count);
+
+void emoji_img_release_layout(void* layout);
+
+// Write as a PNG file. Returns the cairo_status_t (0 on success).
+int emoji_img_save(EmojiImageManipulator* manip, const char* output_path);
+
+// Encode as PNG into a malloc'd buffer released with emoji_img_free. Returns 0 on success.
+int emoji_img_encode_png(EmojiImageManipulator* manip, unsigned char** out, size_t* length);
+
+void emoji_img_free(void* ptr);
+
+// Finish pending drawing so the pixel memory is up to date
+void emoji_img_flush(EmojiImageManipulator* manip);
 
-void emoji_img_add_text_gradient(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* color1, const char* color2, int vertical);
+// Copy the image into a new ARGB32 surface
+EmojiImageManipulator* emoji_img_copy(EmojiImageManipulator* manip);
 
-void emoji_img_add_text_shadow(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* color, double shadow_x, double shadow_y, const char* shadow_color, double shadow_opacity);
+int emoji_img_get_width(EmojiImageManipulator* manip);
 
-void emoji_img_add_textbox(EmojiImageManipulator* manip, const char* text, double x, double y, const char* font_family, double font_size, const char* text_color, const char* bg_color, double padding, const char* border_color, double border_width);
+int emoji_img_get_height(EmojiImageManipulator* manip);
 
-void emoji_img_save(EmojiImageManipulator* manip, const char* output_path);
+// Export pixels as straight-alpha RGBA into out (width * height * 4 bytes)
+void emoji_img_export_rgba(EmojiImageManipulator* manip, unsigned char* out);
 
 void emoji_img_destroy(EmojiImageManipulator* manip);
 
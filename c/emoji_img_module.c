@@ -0,0 +1,303 @@
+// CPython bindings for the emoji_img C API.
+//
+// Built into the same pyemoji2._emoji_img extension as emoji_img.c, so the
+// library stays loadable through ctypes as a fallback. Functions use
+// METH_FASTCALL, take str arguments without copying (UTF-8 is cached on the
+// str object) and release the GIL while Cairo/Pango draw.
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <string.h>
+
+#include "emoji_img.h"
+
+// Interned attribute names of Text/TextBox
+static PyObject *str_text, *str_font, *str_size, *str_color, *str_markup, *str_kind;
+static PyObject *str_outline_color, *str_outline_width;
+static PyObject *str_gradient_colors, *str_gradient_vertical;
+static PyObject *str_shadow_offset, *str_shadow_color, *str_shadow_opacity;
+static PyObject *str_background, *str_padding, *str_border_color, *str_border_width;
+
+// Attribute values fetched from a Text object; released after drawing
+#define MAX_HELD 24
+
+typedef struct {
+    PyObject *items[MAX_HELD];
+    int count;
+} Held;
+
+static void held_release(Held *held) {
+    for (int i = 0; i < held->count; i++) {
+        Py_DECREF(held->items[i]);
+    }
+    held->count = 0;
+}
+
+static EmojiImageManipulator* get_manip(PyObject *addr) {
+    void *ptr = PyLong_AsVoidPtr(addr);
+    if (ptr == NULL) {
+        if (!PyErr_Occurred()) {
+            PyErr_SetString(PyExc_RuntimeError, "Image has been closed or not properly initialized");
+        }
+        return NULL;
+    }
+    return (EmojiImageManipulator*)ptr;
+}
+
+static const char* as_utf8(PyObject *obj, const char *what) {
+    if (!PyUnicode_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "%s must be str, not %.100s", what, Py_TYPE(obj)->tp_name);
+        return NULL;
+    }
+    return PyUnicode_AsUTF8AndSize(obj, NULL);
+}
+
+static int as_double(PyObject *obj, double *out) {
+    *out = PyFloat_AsDouble(obj);
+    return !(*out == -1.0 && PyErr_Occurred());
+}
+
+// Fetch obj.name, keeping a reference in held. Returns NULL on error.
+static PyObject* get_attr(PyObject *obj, PyObject *name, Held *held) {
+    PyObject *value = PyObject_GetAttr(obj, name);
+    if (value == NULL) {
+        return NULL;
+    }
+    if (held->count == MAX_HELD) {
+        Py_DECREF(value);
+        PyErr_SetString(PyExc_RuntimeError, "too many attributes held");
+        return NULL;
+    }
+    held->items[held->count++] = value;
+    return value;
+}
+
+// String attribute; None (or a falsy value) gives fallback
+static int get_str(PyObject *obj, PyObject *name, const char *fallback, Held *held, const char **out) {
+    PyObject *value = get_attr(obj, name, held);
+    if (value == NULL) {
+        return 0;
+    }
+    if (fallback != NULL && (value == Py_None || PyObject_Not(value) == 1)) {
+        *out = fallback;
+        return 1;
+    }
+    *out = as_utf8(value, PyUnicode_AsUTF8(name));
+    return *out != NULL;
+}
+
+static int get_double(PyObject *obj, PyObject *name, Held *held, double *out) {
+    PyObject *value = get_attr(obj, name, held);
+    return value != NULL && as_double(value, out);
+}
+
+// Two-item sequence attribute such as shadow_offset or gradient_colors.
+// Returns 1 when set, 0 when None/empty, -1 on error.
+static int get_pair(PyObject *obj, PyObject *name, Held *held, PyObject **first, PyObject **second) {
+    PyObject *value = get_attr(obj, name, held);
+    if (value == NULL) {
+        return -1;
+    }
+    int truth = PyObject_IsTrue(value);
+    if (truth <= 0) {
+        return truth;
+    }
+    PyObject *seq = PySequence_Fast(value, "expected a pair");
+    if (seq == NULL) {
+        return -1;
+    }
+    held->items[held->count - 1] = seq;  // seq keeps value's items alive
+    Py_DECREF(value);
+    if (PySequence_Fast_GET_SIZE(seq) != 2) {
+        PyErr_Format(PyExc_ValueError, "%U must have two items", name);
+        return -1;
+    }
+    *first = PySequence_Fast_GET_ITEM(seq, 0);
+    *second = PySequence_Fast_GET_ITEM(seq, 1);
+    return 1;
+}
+
+// add_text(manip, text, x, y, font_family, font_size, color)
+static PyObject* py_add_text(PyObject *self, PyObject *const *args, Py_ssize_t nargs) {
+    if (nargs != 7) {
+        PyErr_Format(PyExc_TypeError, "add_text() takes 7 arguments (%zd given)", nargs);
+        return NULL;
+    }
+    EmojiImageManipulator *manip = get_manip(args[0]);
+    const char *text, *font, *color;
+    double x, y, size;
+    if (manip == NULL ||
+        (text = as_utf8(args[1], "text")) == NULL ||
+        !as_double(args[2], &x) || !as_double(args[3], &y) ||
+        (font = as_utf8(args[4], "font_family")) == NULL ||
+        !as_double(args[5], &size) ||
+        (color = as_utf8(args[6], "color")) == NULL) {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    emoji_img_add_text(manip, text, x, y, font, size, color);
+    Py_END_ALLOW_THREADS
+
+    Py_RETURN_NONE;
+}
+
+// Is obj.name set to a truthy value? Returns 1/0, or -1 on error.
+static int get_truth(PyObject *obj, PyObject *name, Held *held) {
+    PyObject *value = get_attr(obj, name, held);
+    return value == NULL ? -1 : PyObject_IsTrue(value);
+}
+
+// Fill an EmojiTextStyle from a Text/TextBox, mirroring Text.style()
+static int read_style(PyObject *obj, Held *held, EmojiTextStyle *style) {
+    PyObject *first, *second;
+    int has;
+
+    memset(style, 0, sizeof(*style));
+    if (!get_str(obj, str_font, NULL, held, &style->font_family) ||
+        !get_double(obj, str_size, held, &style->font_size) ||
+        !get_str(obj, str_color, NULL, held, &style->color) ||
+        (style->markup = get_truth(obj, str_markup, held)) < 0) {
+        return 0;
+    }
+
+    // Shadow
+    if ((has = get_pair(obj, str_shadow_offset, held, &first, &second)) < 0) {
+        return 0;
+    }
+    if (has) {
+        style->has_shadow = 1;
+        if (!as_double(first, &style->shadow_x) || !as_double(second, &style->shadow_y) ||
+            !get_str(obj, str_shadow_color, "gray", held, &style->shadow_color) ||
+            !get_double(obj, str_shadow_opacity, held, &style->shadow_opacity)) {
+            return 0;
+        }
+    }
+
+    // Outline
+    if ((has = get_truth(obj, str_outline_color, held)) < 0) {
+        return 0;
+    }
+    if (has) {
+        if (!get_str(obj, str_outline_color, NULL, held, &style->outline_color) ||
+            !get_double(obj, str_outline_width, held, &style->outline_width)) {
+            return 0;
+        }
+    }
+
+    // Gradient
+    if ((has = get_pair(obj, str_gradient_colors, held, &first, &second)) < 0) {
+        return 0;
+    }
+    if (has) {
+        if ((style->gradient_color1 = as_utf8(first, "gradient color")) == NULL ||
+            (style->gradient_color2 = as_utf8(second, "gradient color")) == NULL ||
+            (style->gradient_vertical = get_truth(obj, str_gradient_vertical, held)) < 0) {
+            return 0;
+        }
+    }
+
+    // Box
+    PyObject *kind = get_attr(obj, str_kind, held);
+    if (kind == NULL) {
+        return 0;
+    }
+    if (PyUnicode_Check(kind) && PyUnicode_CompareWithASCIIString(kind, "textbox") == 0) {
+        if (!get_str(obj, str_background, "white", held, &style->background) ||
+            !get_double(obj, str_padding, held, &style->padding) ||
+            !get_str(obj, str_border_color, "black", held, &style->border_color) ||
+            !get_double(obj, str_border_width, held, &style->border_width)) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
+// add(manip, text_obj, x, y): draw a Text or TextBox with all its effects
+static PyObject* py_add(PyObject *self, PyObject *const *args, Py_ssize_t nargs) {
+    if (nargs != 4) {
+        PyErr_Format(PyExc_TypeError, "add() takes 4 arguments (%zd given)", nargs);
+        return NULL;
+    }
+    EmojiImageManipulator *manip = get_manip(args[0]);
+    PyObject *obj = args[1];
+    double x, y;
+    if (manip == NULL || !as_double(args[2], &x) || !as_double(args[3], &y)) {
+        return NULL;
+    }
+
+    Held held = {{NULL}, 0};
+    EmojiTextStyle style;
+    const char *text;
+    if (!get_str(obj, str_text, NULL, &held, &text) || !read_style(obj, &held, &style)) {
+        held_release(&held);
+        return NULL;
+    }
+
+    int status;
+    Py_BEGIN_ALLOW_THREADS
+    status = emoji_img_draw_text(manip, &style, text, x, y);
+    Py_END_ALLOW_THREADS
+
+    if (status == EMOJI_IMG_INVALID_MARKUP) {
+        PyErr_Format(PyExc_ValueError, "Invalid Pango markup: %s", text);
+    } else if (status != 0) {
+        PyErr_Format(PyExc_RuntimeError, "Failed to draw text (status %d)", status);
+    }
+    held_release(&held);
+    if (status != 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef module_methods[] = {
+    {"add_text", (PyCFunction)(void(*)(void))py_add_text, METH_FASTCALL,
+     "add_text(manip, text, x, y, font_family, font_size, color)"},
+    {"add", (PyCFunction)(void(*)(void))py_add, METH_FASTCALL,
+     "add(manip, text_obj, x, y): draw a Text or TextBox with all its effects"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module_def = {
+    PyModuleDef_HEAD_INIT,
+    "_emoji_img",
+    "Native bindings for pyemoji2.",
+    -1,
+    module_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+};
+
+static int intern_names(void) {
+#define INTERN(name) if ((str_##name = PyUnicode_InternFromString(#name)) == NULL) return -1
+    INTERN(text);
+    INTERN(font);
+    INTERN(size);
+    INTERN(color);
+    INTERN(markup);
+    INTERN(kind);
+    INTERN(outline_color);
+    INTERN(outline_width);
+    INTERN(gradient_colors);
+    INTERN(gradient_vertical);
+    INTERN(shadow_offset);
+    INTERN(shadow_color);
+    INTERN(shadow_opacity);
+    INTERN(background);
+    INTERN(padding);
+    INTERN(border_color);
+    INTERN(border_width);
+#undef INTERN
+    return 0;
+}
+
+PyMODINIT_FUNC PyInit__emoji_img(void) {
+    if (intern_names() < 0) {
+        return NULL;
+    }
+    return PyModule_Create(&module_def);
+}
@@ -5,10 +5,18 @@
 int main() {
 
     EmojiImageManipulator* manip = emoji_img_create("../input.png");
+    if (manip == NULL) {
+        fprintf(stderr, "Failed to load ../input.png\n");
+        return 1;
+    }
 
     emoji_img_add_text(manip, "Hello 😀", 50, 50, "Sans", 30, "red");
 
-    emoji_img_save(manip, "../output_c.png");
+    if (emoji_img_save(manip, "../output_c.png") != 0) {
+        fprintf(stderr, "Failed to write ../output_c.png\n");
+        emoji_img_destroy(manip);
+        return 1;
+    }
 
     emoji_img_destroy(manip);
 
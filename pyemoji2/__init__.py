@@ -1,4 +1,5 @@
+from .animation import Animation
 from .core import Image
 from .text import Text, TextBox
 
-__all__ = ["Image", "Text", "TextBox"]
+__all__ = ["Animation", "Image", "Text", "TextBox"]
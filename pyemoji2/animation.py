@@ -0,0 +1,194 @@
+"""
+Animated PNG (APNG) output for text that changes from frame to frame.
+"""
+
+import os
+import struct
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# fcTL dispose/blend ops: keep the previous frame and replace the region
+_DISPOSE_NONE = 0
+_BLEND_SOURCE = 0
+
+
+def _chunk(kind, data):
+    body = kind + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+def _first_difference(a, b):
+    """Index of the first differing byte of two equal-length buffers."""
+    lo, hi = 0, len(a)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[lo : mid + 1] == b[lo : mid + 1]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _last_difference(a, b):
+    """Index of the last differing byte of two equal-length buffers."""
+    lo, hi = 0, len(a)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[mid:hi] == b[mid:hi]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo - 1
+
+
+def changed_region(previous, current, width, height):
+    """Bounding box (x, y, w, h) of the pixels that differ, or None."""
+    if previous == current:
+        return None
+
+    row_size = width * 4
+    top = _first_difference(previous, current) // row_size
+    bottom = _last_difference(previous, current) // row_size
+
+    left, right = width, -1
+    for row in range(top, bottom + 1):
+        start = row * row_size
+        a = previous[start : start + row_size]
+        b = current[start : start + row_size]
+        if a == b:
+            continue
+        left = min(left, _first_difference(a, b) // 4)
+        right = max(right, _last_difference(a, b) // 4)
+    return left, top, right - left + 1, bottom - top + 1
+
+
+def _delay(duration):
+    """fcTL delay fraction for a duration in milliseconds."""
+    if duration <= 0xFFFF:
+        return duration, 1000
+    return min(round(duration / 10), 0xFFFF), 100
+
+
+def _compress_region(pixels, width, region, level):
+    x, y, w, h = region
+    row_size = width * 4
+    rows = []
+    for row in range(y, y + h):
+        start = row * row_size + x * 4
+        rows.append(b"\x00" + pixels[start : start + w * 4])
+    return zlib.compress(b"".join(rows), level)
+
+
+class Animation:
+    """Build an animated PNG from a base image and per-frame text.
+
+    The base is an Image or a sequence of Images (frame n draws onto
+    base[n % len(base)]). Overlays passed to add() appear on every frame
+    and are drawn once; frame() records the text for one frame.
+
+    Only the rectangle that changed since the previous frame is encoded,
+    and identical frames are merged into a longer one.
+    """
+
+    def __init__(self, base, loops=0):
+        bases = list(base) if isinstance(base, (list, tuple)) else [base]
+        if not bases:
+            raise ValueError("Animation needs at least one base image")
+        self._bases = [img.copy() for img in bases]
+        self._frames = []
+        self.loops = loops
+        self.width = self._bases[0].width
+        self.height = self._bases[0].height
+        for img in self._bases[1:]:
+            if (img.width, img.height) != (self.width, self.height):
+                raise ValueError("All base images must have the same size")
+
+    def add(self, text_obj, position):
+        """Draw text on every frame (chainable)."""
+        for img in self._bases:
+            img.add(text_obj, position)
+        return self
+
+    def frame(self, *ops, duration=100):
+        """Append a frame showing the given (text_obj, position) ops.
+
+        duration is in milliseconds (chainable).
+        """
+        if duration <= 0:
+            raise ValueError(f"Invalid frame duration: {duration}")
+        self._frames.append((ops, duration))
+        return self
+
+    def render_frames(self):
+        """Yield (rgba_bytes, duration) for every frame."""
+        for index, (ops, duration) in enumerate(self._frames):
+            with self._bases[index % len(self._bases)].copy() as img:
+                for text_obj, position in ops:
+                    img.add(text_obj, position)
+                yield img.to_rgba(), duration
+
+    def to_bytes(self, compress_level=6):
+        """Encode the animation as APNG bytes."""
+        if not self._frames:
+            raise ValueError("Animation has no frames")
+
+        # Each entry: [region, compressed data, duration]
+        encoded = []
+        previous = None
+        for pixels, duration in self.render_frames():
+            if previous is None:
+                region = (0, 0, self.width, self.height)
+            else:
+                region = changed_region(previous, pixels, self.width, self.height)
+                if region is None:
+                    encoded[-1][2] += duration
+                    continue
+            data = _compress_region(pixels, self.width, region, compress_level)
+            encoded.append([region, data, duration])
+            previous = pixels
+
+        out = [
+            PNG_SIGNATURE,
+            _chunk(
+                b"IHDR",
+                struct.pack(">IIBBBBB", self.width, self.height, 8, 6, 0, 0, 0),
+            ),
+            _chunk(b"acTL", struct.pack(">II", len(encoded), self.loops)),
+        ]
+        sequence = 0
+        for index, ((x, y, w, h), data, duration) in enumerate(encoded):
+            fctl = struct.pack(
+                ">IIIIIHHBB",
+                sequence, w, h, x, y,
+                *_delay(duration), _DISPOSE_NONE, _BLEND_SOURCE,
+            )
+            out.append(_chunk(b"fcTL", fctl))
+            sequence += 1
+            if index == 0:
+                out.append(_chunk(b"IDAT", data))
+            else:
+                out.append(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+        out.append(_chunk(b"IEND", b""))
+        return b"".join(out)
+
+    def save(self, output_path, compress_level=6):
+        """Write the animation to an .png/.apng file (chainable)."""
+        output_path = os.path.abspath(output_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(self.to_bytes(compress_level))
+        return self
+
+    def close(self):
+        """Release the base images."""
+        for img in self._bases:
+            img.close()
+        self._bases = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,164 @@
+"""
+Content-addressed on-disk cache of encoded render results.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Bump when rendering output changes so old entries stop matching
+CACHE_VERSION = b"pyemoji2-render-v1"
+
+
+def canonical_ops(ops):
+    """Serialize op descriptions with defaults filled in and keys sorted."""
+    from .jobs import dump_op, load_op
+
+    return json.dumps(
+        [dump_op(*load_op(op)) for op in ops],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+class RenderCache:
+    """Directory of encoded images keyed by a hash of everything that
+    determines them: base image bytes, ops and output options.
+
+    Entries are written atomically (temp file + rename), so concurrent
+    writers and readers (threads or processes) never see partial files.
+    When the directory grows past max_bytes the least recently used entries
+    are removed until it is back under low_water (a fraction of max_bytes),
+    so the directory is rescanned once per batch of evictions rather than
+    on every store. A hit refreshes its entry's mtime.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, low_water=0.9):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.low_water = int(max_bytes * low_water)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._bytes = sum(size for _, _, size in self._entries())
+
+    @staticmethod
+    def key(base, ops, size=None, format="png"):
+        """Hex digest identifying a render.
+
+        base is the base image bytes (or None for a blank canvas of size).
+        """
+        options = json.dumps(
+            {"format": format.lower(), "size": list(size) if size else None},
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(CACHE_VERSION)
+        for part in (base or b"", options.encode(), canonical_ops(ops).encode()):
+            # Length prefixes keep the parts from running into each other
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached bytes for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass  # Evicted meanwhile; the data read is still valid
+        with self._lock:
+            self._stats["hits"] += 1
+        return data
+
+    def put(self, key, data):
+        """Store data under key."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except BaseException:
+            _unlink(tmp_path)
+            raise
+
+        with self._lock:
+            # Another writer may have stored the same key meanwhile; its size
+            # is already counted
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, path)
+            except BaseException:
+                _unlink(tmp_path)
+                raise
+            self._stats["stores"] += 1
+            self._bytes += len(data) - replaced
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                _unlink(path)
+            self._bytes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _entries(self):
+        """(path, mtime, size) for every stored entry."""
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, st.st_mtime, st.st_size
+
+    def _evict(self):
+        # Rescan so entries written by other processes are accounted for
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.low_water:
+                break
+            if _unlink(path):
+                self._stats["evictions"] += 1
+            total -= size
+        self._bytes = total
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,79 @@
+"""
+Command line job runner: ``python -m pyemoji2 < jobs.jsonl > results.jsonl``.
+
+Reads one JSON job per line (see ``pyemoji2.jobs``), renders them on a warm
+worker pool and writes one JSON status line per job to stdout. A throughput
+summary is written to stderr when the input is exhausted.
+"""
+
+import argparse
+import json
+import sys
+
+from .cache import RenderCache
+from .jobs import InvalidJob, JobRunner
+
+
+def read_jobs(stream):
+    """Yield job dicts from a JSONL stream, skipping blank lines."""
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield InvalidJob(f"Invalid JSON: {e}", job_id=f"line {lineno}")
+            continue
+        if not isinstance(job, dict):
+            yield InvalidJob("Job must be a JSON object", job_id=f"line {lineno}")
+            continue
+        job.setdefault("id", lineno)
+        yield job
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pyemoji2",
+        description="Render a stream of JSON jobs read from stdin",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="Number of worker threads (default: CPU count)",
+    )
+    parser.add_argument(
+        "--unordered", action="store_true",
+        help="Write results as jobs finish instead of in input order",
+    )
+    parser.add_argument(
+        "-i", "--input", type=argparse.FileType("r", encoding="utf-8"),
+        default=sys.stdin, help="Read jobs from a file instead of stdin",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse results of identical jobs from this directory",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=256,
+        help="Maximum cache size in MiB (default: 256)",
+    )
+    parser.add_argument(
+        "--no-summary", action="store_true",
+        help="Do not write the throughput summary to stderr",
+    )
+    args = parser.parse_args(argv)
+
+    cache = None
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+
+    runner = JobRunner(workers=args.workers, ordered=not args.unordered, cache=cache)
+    with runner:
+        for result in runner.run(read_jobs(args.input)):
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+    if not args.no_summary:
+        sys.stderr.write(json.dumps(runner.summary()) + "\n")
+
+    return 1 if runner.stats["failed"] else 0
@@ -0,0 +1,126 @@
+"""
+Blocking client for the render server (``pyemoji2.server``).
+"""
+
+import socket
+
+from . import protocol
+from .jobs import dump_op
+
+
+class RenderError(RuntimeError):
+    """The server could not render a request."""
+
+
+class RenderClient:
+    """Connection to a RenderServer.
+
+    Connect with path (Unix socket) or host/port (TCP). submit() sends a
+    request without waiting, so several requests can be pipelined on one
+    connection; result() collects the answer to a given request id.
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=7878, timeout=None):
+        if path:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(path)
+        else:
+            self._sock = socket.create_connection((host, port), timeout)
+        self._next_id = 1
+        self._responses = {}  # Answers read while waiting for another id
+
+    def submit(self, base=None, ops=(), size=None, format="png"):
+        """Send a render request and return its id.
+
+        base is PNG bytes or an Image; without it, size gives a blank
+        canvas. ops are (text_obj, position) pairs or op dicts.
+        """
+        if base is not None and not isinstance(base, (bytes, bytearray, memoryview)):
+            base = base.to_bytes()
+        metadata = {
+            "ops": [op if isinstance(op, dict) else dump_op(*op) for op in ops],
+            "format": format,
+        }
+        if size is not None:
+            metadata["size"] = list(size)
+        return self._request(protocol.RENDER, metadata, base or b"")
+
+    def result(self, request_id):
+        """Wait for the image rendered for request_id."""
+        kind, metadata, payload = self._wait(request_id)
+        if kind == protocol.ERROR:
+            raise RenderError(metadata.get("error") if metadata else "Render failed")
+        return payload
+
+    def render(self, base=None, ops=(), size=None, format="png"):
+        """Render one job and return the encoded image."""
+        return self.result(self.submit(base, ops, size, format))
+
+    def render_many(self, jobs, window=32):
+        """Render dicts of submit() arguments, pipelining up to window at once.
+
+        Returns encoded images in job order.
+        """
+        ids = []
+        results = []
+        for job in jobs:
+            if len(ids) - len(results) >= window:
+                results.append(self.result(ids[len(results)]))
+            ids.append(self.submit(**job))
+        while len(results) < len(ids):
+            results.append(self.result(ids[len(results)]))
+        return results
+
+    def health(self):
+        """Return the server's health dict."""
+        return self._info(protocol.HEALTH)
+
+    def stats(self):
+        """Return the server's stats dict."""
+        return self._info(protocol.STATS)
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _info(self, kind):
+        kind, metadata, _ = self._wait(self._request(kind))
+        if kind == protocol.ERROR:
+            raise RenderError(metadata.get("error") if metadata else "Request failed")
+        return metadata
+
+    def _request(self, kind, metadata=None, payload=b""):
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF or 1
+        for part in protocol.encode_message(kind, request_id, metadata, payload):
+            self._sock.sendall(part)
+        return request_id
+
+    def _wait(self, request_id):
+        while request_id not in self._responses:
+            kind, answered, meta_len, payload_len = protocol.parse_header(
+                self._read(protocol.HEADER.size)
+            )
+            metadata = protocol.decode_metadata(self._read(meta_len))
+            payload = self._read(payload_len)
+            if answered == 0 and kind == protocol.ERROR:
+                # Connection-level error: the server is closing the connection
+                raise RenderError(metadata.get("error") if metadata else "Protocol error")
+            self._responses[answered] = (kind, metadata, payload)
+        return self._responses.pop(request_id)
+
+    def _read(self, size):
+        buf = bytearray(size)
+        view = memoryview(buf)
+        while view:
+            n = self._sock.recv_into(view)
+            if not n:
+                raise ConnectionError("Render server closed the connection")
+            view = view[n:]
+        return bytes(buf)
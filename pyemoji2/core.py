@@ -1,7 +1,16 @@
 import ctypes
+import functools
+import mmap
 import os
 import pathlib
 import platform
+import threading
+
+try:
+    from . import _emoji_img as _native
+except ImportError:
+    # Local builds of libemoji_img.so only expose the C API: use ctypes
+    _native = None
 
 # Cross-platform font fallbacks
 FONT_FALLBACKS = {
@@ -66,21 +75,250 @@ def find_library():
 
 LIB_PATH = find_library()
 
+# Raw pixel layouts for memory-mapped images (cairo_format_t values).
+# Cairo stores 32-bit native-endian pixels, i.e. B, G, R, A bytes on
+# little-endian machines; BGRA is premultiplied, BGRX ignores the 4th byte.
+RAW_FORMATS = {"BGRA": 0, "BGRX": 1}
+
+# EMOJI_IMG_INVALID_MARKUP status of the text drawing functions
+INVALID_MARKUP = 1
+
 
 class EmojiImageManipulator(ctypes.Structure):
     pass
 
 
+class EmojiTextStyle(ctypes.Structure):
+    _fields_ = [
+        ("font_family", ctypes.c_char_p),
+        ("font_size", ctypes.c_double),
+        ("color", ctypes.c_char_p),
+        ("markup", ctypes.c_int),
+        ("has_shadow", ctypes.c_int),
+        ("shadow_x", ctypes.c_double),
+        ("shadow_y", ctypes.c_double),
+        ("shadow_color", ctypes.c_char_p),
+        ("shadow_opacity", ctypes.c_double),
+        ("outline_color", ctypes.c_char_p),
+        ("outline_width", ctypes.c_double),
+        ("gradient_color1", ctypes.c_char_p),
+        ("gradient_color2", ctypes.c_char_p),
+        ("gradient_vertical", ctypes.c_int),
+        ("background", ctypes.c_char_p),
+        ("padding", ctypes.c_double),
+        ("border_color", ctypes.c_char_p),
+        ("border_width", ctypes.c_double),
+    ]
+
+
+def _encode(value):
+    return value.encode("utf-8") if value is not None else None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_style(style):
+    """Compile a TextStyle into a native EmojiTextStyle (cached per style).
+
+    The struct keeps its encoded strings alive and is only read by C, so one
+    instance is shared by every draw with an equal style.
+    """
+    shadow_x, shadow_y = style.shadow_offset or (0, 0)
+    color1, color2 = style.gradient_colors or (None, None)
+    return EmojiTextStyle(
+        font_family=_encode(style.font),
+        font_size=style.size,
+        color=_encode(style.color),
+        markup=1 if style.markup else 0,
+        has_shadow=1 if style.shadow_offset else 0,
+        shadow_x=shadow_x,
+        shadow_y=shadow_y,
+        shadow_color=_encode(style.shadow_color),
+        shadow_opacity=style.shadow_opacity,
+        outline_color=_encode(style.outline_color),
+        outline_width=style.outline_width,
+        gradient_color1=_encode(color1),
+        gradient_color2=_encode(color2),
+        gradient_vertical=1 if style.gradient_vertical else 0,
+        background=_encode(style.background),
+        padding=style.padding,
+        border_color=_encode(style.border_color),
+        border_width=style.border_width,
+    )
+
+
+def _setup_signatures(lib):
+    lib.emoji_img_create.argtypes = [ctypes.c_char_p]
+    lib.emoji_img_create.restype = ctypes.POINTER(EmojiImageManipulator)
+
+    lib.emoji_img_create_from_data.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+    ]
+    lib.emoji_img_create_from_data.restype = ctypes.POINTER(EmojiImageManipulator)
+
+    lib.emoji_img_create_from_png_data.argtypes = [ctypes.c_char_p, ctypes.c_size_t]
+    lib.emoji_img_create_from_png_data.restype = ctypes.POINTER(EmojiImageManipulator)
+
+    lib.emoji_img_create_for_data.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+    ]
+    lib.emoji_img_create_for_data.restype = ctypes.POINTER(EmojiImageManipulator)
+
+    lib.emoji_img_create_empty.argtypes = [ctypes.c_int, ctypes.c_int]
+    lib.emoji_img_create_empty.restype = ctypes.POINTER(EmojiImageManipulator)
+
+    lib.emoji_img_add_text.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.c_char_p,
+        ctypes.c_double,
+        ctypes.c_double,
+        ctypes.c_char_p,
+        ctypes.c_double,
+        ctypes.c_char_p,
+    ]
+
+    lib.emoji_img_draw_text.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.POINTER(EmojiTextStyle),
+        ctypes.c_char_p,
+        ctypes.c_double,
+        ctypes.c_double,
+    ]
+    lib.emoji_img_draw_text.restype = ctypes.c_int
+
+    lib.emoji_img_shape_text.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.POINTER(EmojiTextStyle),
+        ctypes.c_char_p,
+        ctypes.c_double,
+        ctypes.c_double,
+        ctypes.POINTER(ctypes.c_double),
+    ]
+    lib.emoji_img_shape_text.restype = ctypes.c_void_p
+
+    lib.emoji_img_draw_layouts.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.POINTER(EmojiTextStyle),
+        ctypes.POINTER(ctypes.c_void_p),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int,
+    ]
+
+    lib.emoji_img_release_layout.argtypes = [ctypes.c_void_p]
+
+    lib.emoji_img_save.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.c_char_p,
+    ]
+    lib.emoji_img_save.restype = ctypes.c_int
+
+    lib.emoji_img_encode_png.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte)),
+        ctypes.POINTER(ctypes.c_size_t),
+    ]
+    lib.emoji_img_encode_png.restype = ctypes.c_int
+    lib.emoji_img_free.argtypes = [ctypes.c_void_p]
+
+    lib.emoji_img_flush.argtypes = [ctypes.POINTER(EmojiImageManipulator)]
+
+    lib.emoji_img_copy.argtypes = [ctypes.POINTER(EmojiImageManipulator)]
+    lib.emoji_img_copy.restype = ctypes.POINTER(EmojiImageManipulator)
+
+    lib.emoji_img_get_width.argtypes = [ctypes.POINTER(EmojiImageManipulator)]
+    lib.emoji_img_get_width.restype = ctypes.c_int
+    lib.emoji_img_get_height.argtypes = [ctypes.POINTER(EmojiImageManipulator)]
+    lib.emoji_img_get_height.restype = ctypes.c_int
+
+    lib.emoji_img_export_rgba.argtypes = [
+        ctypes.POINTER(EmojiImageManipulator),
+        ctypes.c_char_p,
+    ]
+
+    lib.emoji_img_destroy.argtypes = [ctypes.POINTER(EmojiImageManipulator)]
+
+
+_lib = None
+_lib_lock = threading.Lock()
+
+
+def load_library():
+    """Load the shared library once and share it between all images."""
+    global _lib
+    if _lib is None:
+        with _lib_lock:
+            if _lib is None:
+                lib = ctypes.CDLL(str(LIB_PATH))
+                _setup_signatures(lib)
+                _lib = lib
+    return _lib
+
+
+def _check_raw_file(path, width, height, stride, format, create):
+    """Validate a raw pixel file layout; returns (cairo format, stride, size)."""
+    if format not in RAW_FORMATS:
+        raise ValueError(f"Unsupported raw format: {format!r}")
+    if width <= 0 or height <= 0 or width > 65535 or height > 65535:
+        raise ValueError(f"Invalid image dimensions: {width}x{height}")
+    if stride is None:
+        stride = width * 4
+    # Cairo needs whole 32-bit pixels per row, 4-byte aligned
+    if stride < width * 4 or stride % 4:
+        raise ValueError(f"Invalid stride {stride} for width {width}")
+    size = stride * height
+    if not create and os.path.getsize(path) < size:
+        raise ValueError(f"{path} is smaller than {width}x{height} with stride {stride}")
+    return RAW_FORMATS[format], stride, size
+
+
+def _map_raw_file(path, width, height, stride, format, create, write_through):
+    """Map a raw pixel file; returns (mapping, ctypes view, cairo format, stride)."""
+    fmt, stride, size = _check_raw_file(path, width, height, stride, format, create)
+
+    if create:
+        mode = "w+b"
+    else:
+        # Copy-on-write mappings only read the file, so read-only files work
+        mode = "r+b" if write_through else "rb"
+    with open(path, mode) as f:
+        if create:
+            f.truncate(size)
+        elif os.fstat(f.fileno()).st_size < size:
+            raise ValueError(f"{path} shrank while being opened")
+        access = mmap.ACCESS_WRITE if write_through else mmap.ACCESS_COPY
+        # The mapping stays valid after the file is closed
+        mapping = mmap.mmap(f.fileno(), size, access=access)
+
+    # Shares the mapped memory; nothing is copied
+    view = (ctypes.c_ubyte * size).from_buffer(mapping)
+    return mapping, view, fmt, stride
+
+
 class Image:
-    def __init__(self, image_path=None, image_data=None, empty_size=None):
+    def __init__(
+        self,
+        image_path=None,
+        image_data=None,
+        empty_size=None,
+        mmap_file=None,
+        png_data=None,
+    ):
         self._lib = None
         self._manip = None
+        self._addr = None  # Raw pointer for the native bindings
         self._data_ref = None  # Keep reference to data to prevent GC
+        self._mmap = None  # Mapping behind _data_ref for mmap-backed images
+        self._display_list = None  # Pending ops while deferred
         self._is_closed = False
 
         try:
-            self._lib = ctypes.CDLL(str(LIB_PATH))
-            self._setup_signatures()
+            self._lib = load_library()
 
             if image_path:
                 # Normalize path for cross-platform compatibility
@@ -103,102 +341,31 @@ class Image:
                 if width <= 0 or height <= 0 or width > 65535 or height > 65535:
                     raise ValueError(f"Invalid image dimensions: {width}x{height}")
                 self._manip = self._lib.emoji_img_create_empty(width, height)
+            elif mmap_file:
+                # Expecting (path, width, height, stride, format, create, write_through)
+                width, height = mmap_file[1:3]
+                self._mmap, self._data_ref, fmt, stride = _map_raw_file(*mmap_file)
+                self._manip = self._lib.emoji_img_create_for_data(
+                    self._data_ref, fmt, width, height, stride
+                )
+            elif png_data:
+                self._manip = self._lib.emoji_img_create_from_png_data(
+                    bytes(png_data), len(png_data)
+                )
             else:
-                raise ValueError("Must provide image_path, image_data, or empty_size")
+                raise ValueError(
+                    "Must provide image_path, image_data, empty_size, mmap_file, "
+                    "or png_data"
+                )
 
-            if self._manip is None:
+            if not self._manip:
                 raise RuntimeError("Failed to create image manipulator")
+            self._addr = ctypes.cast(self._manip, ctypes.c_void_p).value
 
         except Exception as e:
             self._cleanup()
             raise RuntimeError(f"Failed to initialize image: {e}") from e
 
-    def _setup_signatures(self):
-        self._lib.emoji_img_create.argtypes = [ctypes.c_char_p]
-        self._lib.emoji_img_create.restype = ctypes.POINTER(EmojiImageManipulator)
-
-        self._lib.emoji_img_create_from_data.argtypes = [
-            ctypes.POINTER(ctypes.c_ubyte),
-            ctypes.c_int,
-            ctypes.c_int,
-            ctypes.c_int,
-        ]
-        self._lib.emoji_img_create_from_data.restype = ctypes.POINTER(
-            EmojiImageManipulator
-        )
-
-        self._lib.emoji_img_create_empty.argtypes = [ctypes.c_int, ctypes.c_int]
-        self._lib.emoji_img_create_empty.restype = ctypes.POINTER(EmojiImageManipulator)
-
-        self._lib.emoji_img_add_text.argtypes = [
-            ctypes.POINTER(EmojiImageManipulator),
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_char_p,
-        ]
-
-        # Advanced text functions
-        self._lib.emoji_img_add_text_outlined.argtypes = [
-            ctypes.POINTER(EmojiImageManipulator),
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_char_p,
-            ctypes.c_double,
-        ]
-
-        self._lib.emoji_img_add_text_gradient.argtypes = [
-            ctypes.POINTER(EmojiImageManipulator),
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_char_p,
-            ctypes.c_int,
-        ]
-
-        self._lib.emoji_img_add_text_shadow.argtypes = [
-            ctypes.POINTER(EmojiImageManipulator),
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-        ]
-
-        self._lib.emoji_img_add_textbox.argtypes = [
-            ctypes.POINTER(EmojiImageManipulator),
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_char_p,
-            ctypes.c_double,
-            ctypes.c_char_p,
-            ctypes.c_double,
-        ]
-
-        self._lib.emoji_img_save.argtypes = [
-            ctypes.POINTER(EmojiImageManipulator),
-            ctypes.c_char_p,
-        ]
-        self._lib.emoji_img_destroy.argtypes = [ctypes.POINTER(EmojiImageManipulator)]
-
     def add_text(self, text, x, y, font_family=None, font_size=20.0, color="black"):
         """Add simple text (backward compatible)."""
         if self._is_closed or self._lib is None or self._manip is None:
@@ -207,21 +374,31 @@ class Image:
         if font_family is None:
             font_family = get_system_fonts()[0]  # Use best system font
 
+        if self._display_list is not None:
+            from .text import Text
+
+            text_obj = Text(text, font=font_family, size=font_size).with_color(color)
+            self._display_list.record(text_obj, (x, y))
+            return self
+
         # Try font fallbacks if the primary font fails
         fonts_to_try = [font_family] + get_system_fonts()
         last_error = None
 
         for font in fonts_to_try:
             try:
-                self._lib.emoji_img_add_text(
-                    self._manip,
-                    text.encode("utf-8"),
-                    x,
-                    y,
-                    font.encode("utf-8"),
-                    font_size,
-                    color.encode("utf-8"),
-                )
+                if _native is not None:
+                    _native.add_text(self._addr, text, x, y, font, font_size, color)
+                else:
+                    self._lib.emoji_img_add_text(
+                        self._manip,
+                        text.encode("utf-8"),
+                        x,
+                        y,
+                        font.encode("utf-8"),
+                        font_size,
+                        color.encode("utf-8"),
+                    )
                 return self  # Success, return
             except (OSError, UnicodeEncodeError) as e:
                 last_error = e
@@ -233,92 +410,186 @@ class Image:
         ) from last_error
 
     def add(self, text_obj, position):
-        """Add Text or TextBox object (new API)."""
+        """Add Text or TextBox object (new API).
+
+        Raises ValueError if the text is markup (markup=True) that Pango
+        can't parse.
+        """
         if self._is_closed or self._lib is None or self._manip is None:
             raise RuntimeError("Image has been closed or not properly initialized")
 
-        from .text import TextBox
+        if self._display_list is not None:
+            self._display_list.record(text_obj, position)
+            return self
 
         x, y = position
+        self._draw(text_obj, x, y)
+        return self  # Chainable
 
-        if isinstance(text_obj, TextBox):
-            # Render as textbox
-            self._lib.emoji_img_add_textbox(
-                self._manip,
-                text_obj.text.encode("utf-8"),
-                x,
-                y,
-                text_obj.font.encode("utf-8"),
-                text_obj.size,
-                text_obj.color.encode("utf-8"),
-                (text_obj.background or "white").encode("utf-8"),
-                text_obj.padding,
-                (text_obj.border_color or "black").encode("utf-8"),
-                text_obj.border_width,
-            )
-        elif text_obj.gradient_colors:
-            # Render with gradient
-            c1, c2 = text_obj.gradient_colors
-            self._lib.emoji_img_add_text_gradient(
-                self._manip,
-                text_obj.text.encode("utf-8"),
-                x,
-                y,
-                text_obj.font.encode("utf-8"),
-                text_obj.size,
-                c1.encode("utf-8"),
-                c2.encode("utf-8"),
-                1 if text_obj.gradient_vertical else 0,
-            )
-        elif text_obj.shadow_offset:
-            # Render with shadow
-            sx, sy = text_obj.shadow_offset
-            self._lib.emoji_img_add_text_shadow(
-                self._manip,
-                text_obj.text.encode("utf-8"),
-                x,
-                y,
-                text_obj.font.encode("utf-8"),
-                text_obj.size,
-                text_obj.color.encode("utf-8"),
-                sx,
-                sy,
-                text_obj.shadow_color.encode("utf-8"),
-                text_obj.shadow_opacity,
-            )
-        elif text_obj.outline_color:
-            # Render with outline
-            self._lib.emoji_img_add_text_outlined(
-                self._manip,
-                text_obj.text.encode("utf-8"),
-                x,
-                y,
-                text_obj.font.encode("utf-8"),
-                text_obj.size,
-                text_obj.color.encode("utf-8"),
-                text_obj.outline_color.encode("utf-8"),
-                text_obj.outline_width,
-            )
-        else:
-            # Simple text
-            self.add_text(
-                text_obj.text, x, y, text_obj.font, text_obj.size, text_obj.color
-            )
+    def defer(self):
+        """Record add()/add_text() calls instead of drawing them (chainable).
 
-        return self  # Chainable
+        Recorded ops run on save(), to_bytes(), to_rgba(), copy() and
+        flush(), reordered into batches that share a style; see
+        pyemoji2.display_list.DisplayList.
+        """
+        self._check_open()
+        if self._display_list is None:
+            from .display_list import DisplayList
+
+            self._display_list = DisplayList()
+        return self
+
+    @property
+    def display_list(self):
+        """The DisplayList of pending ops, or None when drawing immediately."""
+        return self._display_list
+
+    def _execute_pending(self):
+        if self._display_list:
+            self._display_list.execute(self)
+
+    def _draw(self, text_obj, x, y):
+        if _native is not None:
+            # Reads the Text attributes natively, no per-argument conversion
+            _native.add(self._addr, text_obj, x, y)
+            return
+
+        # Shadow, outline and fill (gradient or solid) in one native pass
+        status = self._lib.emoji_img_draw_text(
+            self._manip,
+            compile_style(text_obj.style()),
+            text_obj.text.encode("utf-8"),
+            x,
+            y,
+        )
+        if status == INVALID_MARKUP:
+            raise ValueError(f"Invalid Pango markup: {text_obj.text}")
+        if status != 0:
+            raise RuntimeError(f"Failed to draw text (status {status})")
+
+    def _shape(self, text_obj, style, x, y):
+        """Shape an op for deferred drawing.
+
+        Returns (layout, ink, cover): a layout handle to pass to
+        _draw_layouts() and then _release_layout(), the (x0, y0, x1, y1)
+        bounds of everything the op paints, and its opaque box interior
+        (None for ops without a background).
+        """
+        extents = (ctypes.c_double * 8)()
+        layout = self._lib.emoji_img_shape_text(
+            self._manip,
+            compile_style(style),
+            text_obj.text.encode("utf-8"),
+            x,
+            y,
+            extents,
+        )
+        if not layout:
+            raise ValueError(f"Invalid Pango markup: {text_obj.text}")
+        ink = tuple(extents[:4])
+        cover = tuple(extents[4:]) if style.background else None
+        return layout, ink, cover
+
+    def _draw_layouts(self, style, layouts, positions):
+        """Draw shaped layouts that all have the given style."""
+        count = len(layouts)
+        self._lib.emoji_img_draw_layouts(
+            self._manip,
+            compile_style(style),
+            (ctypes.c_void_p * count)(*layouts),
+            (ctypes.c_double * (2 * count))(*(v for xy in positions for v in xy)),
+            count,
+        )
+
+    def _release_layout(self, layout):
+        self._lib.emoji_img_release_layout(layout)
 
     def save(self, output_path):
         """Save image to file."""
         if self._is_closed or self._lib is None or self._manip is None:
             raise RuntimeError("Image has been closed or not properly initialized")
 
+        self._execute_pending()
+
         # Ensure output directory exists
         output_path = os.path.abspath(output_path)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-        self._lib.emoji_img_save(self._manip, output_path.encode("utf-8"))
+        status = self._lib.emoji_img_save(self._manip, output_path.encode("utf-8"))
+        if status != 0:
+            raise RuntimeError(
+                f"Failed to save image to {output_path} (cairo status {status})"
+            )
         return self  # Chainable
 
+    def to_bytes(self):
+        """Return the image encoded as PNG bytes."""
+        self._check_open()
+        self._execute_pending()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        length = ctypes.c_size_t()
+        status = self._lib.emoji_img_encode_png(
+            self._manip, ctypes.byref(data), ctypes.byref(length)
+        )
+        if status != 0:
+            raise RuntimeError("Failed to encode image as PNG")
+        try:
+            return ctypes.string_at(data, length.value)
+        finally:
+            self._lib.emoji_img_free(data)
+
+    @property
+    def width(self):
+        """Image width in pixels."""
+        self._check_open()
+        return self._lib.emoji_img_get_width(self._manip)
+
+    @property
+    def height(self):
+        """Image height in pixels."""
+        self._check_open()
+        return self._lib.emoji_img_get_height(self._manip)
+
+    def copy(self):
+        """Return an independent copy of this image."""
+        self._check_open()
+        self._execute_pending()
+        img = Image.__new__(Image)
+        img._lib = self._lib
+        img._manip = self._lib.emoji_img_copy(self._manip)
+        img._addr = ctypes.cast(img._manip, ctypes.c_void_p).value
+        img._data_ref = None
+        img._mmap = None
+        img._display_list = None
+        img._is_closed = False
+        return img
+
+    def to_rgba(self):
+        """Return the pixels as straight-alpha RGBA bytes, row by row."""
+        self._check_open()
+        self._execute_pending()
+        buf = ctypes.create_string_buffer(self.width * self.height * 4)
+        self._lib.emoji_img_export_rgba(self._manip, buf)
+        return buf.raw
+
+    def flush(self):
+        """Write pending drawing to the pixel memory (chainable).
+
+        Deferred ops are executed first. For mmap-backed images this also
+        flushes the mapping to its file.
+        """
+        self._check_open()
+        self._execute_pending()
+        self._lib.emoji_img_flush(self._manip)
+        if self._mmap is not None:
+            self._mmap.flush()
+        return self
+
+    def _check_open(self):
+        if self._is_closed or self._lib is None or self._manip is None:
+            raise RuntimeError("Image has been closed or not properly initialized")
+
     def _cleanup(self):
         """Clean up resources."""
         if self._manip and self._lib:
@@ -327,7 +598,16 @@ class Image:
             except Exception:
                 pass  # Ignore errors during cleanup
         self._manip = None
+        self._addr = None
+        self._display_list = None  # Pending ops are discarded
+        # Drop the ctypes view first: the mapping can't close while it is exported
         self._data_ref = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Still referenced elsewhere; unmapped when collected
+            self._mmap = None
         self._is_closed = True
 
     def close(self):
@@ -359,6 +639,33 @@ class Image:
         """Create empty image."""
         return cls(empty_size=(width, height))
 
+    @classmethod
+    def from_bytes(cls, data):
+        """Create Image from PNG bytes."""
+        return cls(png_data=data)
+
+    @classmethod
+    def from_mmap(
+        cls, path, width, height, stride=None, format="BGRA", write_through=True
+    ):
+        """Draw directly on a raw pixel file through a memory mapping.
+
+        format is "BGRA" (premultiplied) or "BGRX"; stride defaults to
+        width * 4. With write_through=False the mapping is copy-on-write
+        and the file is left untouched. Raises ValueError for an unknown
+        format, a bad stride or a file too small for the given size.
+        """
+        _check_raw_file(path, width, height, stride, format, create=False)
+        return cls(
+            mmap_file=(path, width, height, stride, format, False, write_through)
+        )
+
+    @classmethod
+    def create_mmap(cls, path, width, height, stride=None, format="BGRA"):
+        """Create (or truncate) a blank raw pixel file and draw on it in place."""
+        _check_raw_file(path, width, height, stride, format, create=True)
+        return cls(mmap_file=(path, width, height, stride, format, True, True))
+
     @classmethod
     def from_pil(cls, pil_image):
         """Create Image from PIL Image."""
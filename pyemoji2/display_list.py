@@ -0,0 +1,199 @@
+"""
+Deferred drawing: record ops, then execute them in style batches.
+
+Immediate drawing switches font, colors and effect state whenever
+consecutive ops differ. A DisplayList records ops instead and, when
+executed, measures each op's ink rectangle and:
+
+- skips ops that fall entirely outside the canvas or draw nothing
+- skips ops fully hidden under a later op's opaque box
+- moves each op into the nearest earlier batch with the same style, as long
+  as nothing it would jump over overlaps it, so paint order is preserved
+  wherever it is visible
+
+Each batch is then drawn with one native call. The layouts shaped while
+measuring are held until the batches are drawn, so no text is shaped twice,
+however many ops the list holds.
+"""
+
+import copy
+import json
+
+DISPLAY_LIST_VERSION = 1
+
+
+class DisplayList:
+    """Ordered (text_obj, position) ops waiting to be drawn."""
+
+    def __init__(self, ops=()):
+        self._ops = []
+        for text_obj, position in ops:
+            self.record(text_obj, position)
+
+    def record(self, text_obj, position):
+        """Append an op (chainable).
+
+        The Text is snapshotted, so later changes to it don't affect the op.
+        """
+        x, y = position
+        self._ops.append((copy.copy(text_obj), (x, y)))
+        return self
+
+    @property
+    def ops(self):
+        """The recorded (text_obj, position) pairs, in recording order."""
+        return list(self._ops)
+
+    def clear(self):
+        """Drop every recorded op."""
+        self._ops.clear()
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __iter__(self):
+        return iter(self._ops)
+
+    def plan(self, image):
+        """Return the batches execute() would draw on image.
+
+        Each batch is a (style, [(text_obj, position), ...]) pair, drawn in
+        list order.
+        """
+        batches, layouts = self._plan(image)
+        for layout in layouts:
+            image._release_layout(layout)
+        return [
+            (style, [(text_obj, position) for text_obj, position, _ in items])
+            for style, items in batches
+        ]
+
+    def execute(self, image):
+        """Draw the recorded ops on image and clear the list.
+
+        Returns counts of recorded ops, ops drawn and native batches.
+        """
+        batches, layouts = self._plan(image)
+        try:
+            stats = {
+                "ops": len(self._ops),
+                "drawn": sum(len(items) for _, items in batches),
+                "batches": len(batches),
+            }
+            # Cleared first so a failing batch isn't drawn twice on retry
+            self.clear()
+            for style, items in batches:
+                image._draw_layouts(
+                    style,
+                    [layout for _, _, layout in items],
+                    [position for _, position, _ in items],
+                )
+        finally:
+            for layout in layouts:
+                image._release_layout(layout)
+        return stats
+
+    def _plan(self, image):
+        """Return (batches, layouts).
+
+        batches are (style, [(text_obj, position, layout), ...]) pairs;
+        layouts holds every layout shaped, for the caller to release.
+        """
+        width, height = image.width, image.height
+        layouts = []
+        visible = []
+        try:
+            for text_obj, position in self._ops:
+                style = text_obj.style()
+                layout, ink, cover = image._shape(text_obj, style, *position)
+                layouts.append(layout)
+                x0, y0, x1, y1 = ink
+                if x0 >= x1 or y0 >= y1:
+                    continue  # Nothing to draw
+                if x1 <= 0 or y1 <= 0 or x0 >= width or y0 >= height:
+                    continue  # Off canvas
+                visible.append((text_obj, position, style, layout, ink, cover))
+        except BaseException:
+            for layout in layouts:
+                image._release_layout(layout)
+            raise
+
+        # Occlusion: an op under a later opaque box never shows
+        kept = []
+        covers = []
+        for op in reversed(visible):
+            ink, cover = op[4], op[5]
+            if any(_contains(other, ink) for other in covers):
+                continue
+            kept.append(op)
+            if cover is not None:
+                covers.append(cover)
+        kept.reverse()
+
+        # Coalescing: [style, items, ink rectangles] per batch
+        batches = []
+        for text_obj, position, style, layout, ink, _ in kept:
+            target = None
+            for batch in reversed(batches):
+                if batch[0] == style:
+                    target = batch
+                    break
+                if any(_overlaps(ink, other) for other in batch[2]):
+                    break  # Moving past this batch would change what is on top
+            if target is None:
+                target = [style, [], []]
+                batches.append(target)
+            target[1].append((text_obj, position, layout))
+            target[2].append(ink)
+
+        return [(style, items) for style, items, _ in batches], layouts
+
+    def replay(self, image):
+        """Draw the recorded ops on image one by one, in recording order.
+
+        The list is kept, so it can be replayed onto several images.
+        """
+        for text_obj, position in self._ops:
+            image.add(text_obj, position)
+        return image
+
+    def to_ops(self):
+        """Describe the ops as job op dicts (see pyemoji2.jobs)."""
+        from .jobs import dump_op
+
+        return [dump_op(text_obj, position) for text_obj, position in self._ops]
+
+    @classmethod
+    def from_ops(cls, ops):
+        """Build a DisplayList from job op dicts."""
+        from .jobs import load_op
+
+        return cls(load_op(op) for op in ops)
+
+    def to_json(self):
+        """Serialize the display list to a JSON string."""
+        return json.dumps(
+            {"version": DISPLAY_LIST_VERSION, "ops": self.to_ops()},
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, data):
+        """Inverse of to_json()."""
+        spec = json.loads(data)
+        if not isinstance(spec, dict) or spec.get("version") != DISPLAY_LIST_VERSION:
+            raise ValueError("Unsupported display list format")
+        return cls.from_ops(spec.get("ops", ()))
+
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _contains(outer, inner):
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and inner[2] <= outer[2]
+        and inner[3] <= outer[3]
+    )
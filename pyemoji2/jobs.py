@@ -0,0 +1,259 @@
+"""
+Batch rendering of JSON job descriptions with a persistent worker pool.
+
+A job is a dict such as::
+
+    {
+        "id": "greeting",
+        "input": "photo.png",          # or "size": [width, height]
+        "ops": [
+            {"type": "text", "text": "Hi 👋", "position": [10, 20], "size": 32},
+            {"type": "textbox", "text": "Box", "position": [10, 80],
+             "background": "white", "border_color": "black", "border_width": 2}
+        ],
+        "output": "out/greeting.png",
+        "format": "png"
+    }
+
+Every op is a Text/TextBox description as produced by ``Text.to_dict()``
+plus a ``position``.
+"""
+
+import collections
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .core import Image
+from .text import Text
+
+OUTPUT_FORMATS = ("png",)
+
+
+class InvalidJob(ValueError):
+    """A job description that could not be parsed."""
+
+    def __init__(self, message, job_id=None):
+        super().__init__(message)
+        self.job_id = job_id
+
+    def result(self):
+        return {"id": self.job_id, "status": "error", "error": str(self)}
+
+
+def load_op(spec):
+    """Turn an op description into a (text_obj, position) pair."""
+    spec = dict(spec)
+    try:
+        x, y = spec.pop("position")
+    except KeyError:
+        raise ValueError("Op is missing 'position'") from None
+    return Text.from_dict(spec), (x, y)
+
+
+def dump_op(text_obj, position):
+    """Inverse of load_op(): describe a (text_obj, position) pair."""
+    spec = text_obj.to_dict()
+    spec["position"] = list(position)
+    return spec
+
+
+def open_base(job):
+    """Create the Image a job draws onto."""
+    if job.get("input"):
+        return Image.load(job["input"])
+    if job.get("size"):
+        width, height = job["size"]
+        return Image.create_empty(width, height)
+    raise ValueError("Job needs either 'input' or 'size'")
+
+
+def check_format(fmt):
+    """Normalize an output format name, rejecting unsupported ones."""
+    fmt = (fmt or "png").lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {fmt!r}")
+    return fmt
+
+
+def render_bytes(base, ops, size=None, format="png", cache=None):
+    """Draw op descriptions onto PNG bytes (or a blank canvas of size).
+
+    Returns the encoded result; nothing touches the filesystem. With a
+    RenderCache, exact repeats are answered without rendering.
+    """
+    fmt = check_format(format)
+    if cache is not None:
+        key = cache.key(base, ops, size, fmt)
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    loaded = [load_op(op) for op in ops]
+    if base:
+        img = Image.from_bytes(base)
+    elif size:
+        img = Image.create_empty(*size)
+    else:
+        raise ValueError("Job needs either base image bytes or 'size'")
+    with img:
+        for text_obj, position in loaded:
+            img.add(text_obj, position)
+        data = img.to_bytes()
+
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def render_job(job, cache=None):
+    """Render a single job and return its status dict."""
+    start = time.perf_counter()
+    result = {"id": job.get("id")}
+    try:
+        output = job.get("output")
+        if not output:
+            raise ValueError("Job is missing 'output'")
+        fmt = check_format(
+            job.get("format") or os.path.splitext(output)[1].lstrip(".")
+        )
+
+        if cache is not None:
+            _render_cached(job, output, fmt, cache, result)
+        else:
+            ops = [load_op(op) for op in job.get("ops", ())]
+            with open_base(job) as img:
+                for text_obj, position in ops:
+                    img.add(text_obj, position)
+                img.save(output)
+
+        result.update(status="ok", output=output)
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def _render_cached(job, output, fmt, cache, result):
+    base = None
+    if job.get("input"):
+        with open(job["input"], "rb") as f:
+            base = f.read()
+    ops = job.get("ops", ())
+    size = job.get("size")
+
+    key = cache.key(base, ops, size, fmt)
+    data = cache.get(key)
+    result["cached"] = data is not None
+    if data is None:
+        data = render_bytes(base, ops, size, fmt)
+        cache.put(key, data)
+
+    output = os.path.abspath(output)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "wb") as f:
+        f.write(data)
+
+
+def warm_worker():
+    """Load the library and the thread's font map before the first job."""
+    with Image.create_empty(1, 1) as img:
+        img.add_text(" ", 0, 0)
+
+
+class JobRunner:
+    """Render jobs on a pool of threads that stays warm between jobs.
+
+    The native calls release the GIL, so threads render in parallel while
+    sharing one loaded library. An optional RenderCache answers exact
+    repeats from disk.
+    """
+
+    def __init__(self, workers=None, ordered=True, max_pending=None, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.ordered = ordered
+        self.cache = cache
+        self.max_pending = max_pending or self.workers * 4
+        self.stats = {"jobs": 0, "ok": 0, "failed": 0, "elapsed_s": 0.0}
+        self._pool = None
+
+    def __enter__(self):
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="pyemoji2",
+            initializer=warm_worker,
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Shut the worker pool down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self, jobs):
+        """Render an iterable of jobs, yielding one status dict per job.
+
+        In ordered mode results come back in input order; otherwise they are
+        yielded as soon as each job finishes. InvalidJob items (e.g. lines
+        that failed to parse) are reported as errors without rendering.
+        """
+        if self._pool is None:
+            raise RuntimeError("JobRunner must be used as a context manager")
+
+        start = time.perf_counter()
+        pending = collections.deque() if self.ordered else set()
+
+        for job in jobs:
+            if len(pending) >= self.max_pending:
+                yield from self._drain(pending, block=True)
+            future = self._submit(job)
+            if self.ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+            yield from self._drain(pending, block=False)
+
+        while pending:
+            yield from self._drain(pending, block=True)
+
+        self.stats["elapsed_s"] += time.perf_counter() - start
+
+    def summary(self):
+        """Return counters and throughput for everything run so far."""
+        summary = dict(self.stats)
+        elapsed = summary["elapsed_s"]
+        summary["elapsed_s"] = round(elapsed, 6)
+        summary["jobs_per_s"] = round(summary["jobs"] / elapsed, 3) if elapsed else 0.0
+        if self.cache is not None:
+            summary["cache"] = self.cache.stats()
+        return summary
+
+    def _submit(self, job):
+        if isinstance(job, InvalidJob):
+            return self._pool.submit(job.result)
+        return self._pool.submit(render_job, job, self.cache)
+
+    def _drain(self, pending, block):
+        if self.ordered:
+            while pending and (block or pending[0].done()):
+                yield self._record(pending.popleft().result())
+                block = False
+        else:
+            done, _ = wait(
+                pending, timeout=None if block else 0, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                pending.discard(future)
+                yield self._record(future.result())
+
+    def _record(self, result):
+        self.stats["jobs"] += 1
+        if result["status"] == "ok":
+            self.stats["ok"] += 1
+        else:
+            self.stats["failed"] += 1
+        return result
@@ -0,0 +1,72 @@
+"""
+Binary framing shared by the render server and client.
+
+Every message is a 13-byte header followed by a JSON metadata block and a
+raw payload::
+
+    kind (u8) | request id (u32) | metadata length (u32) | payload length (u32)
+
+Requests:
+
+- RENDER: metadata ``{"ops": [...], "size": [w, h], "format": "png"}``,
+  payload is the base image (PNG bytes) or empty when ``size`` is given
+- HEALTH, STATS: no metadata or payload
+
+Responses carry the id of the request they answer and may arrive out of
+order when requests are pipelined:
+
+- RESULT: payload is the encoded image
+- ERROR: metadata ``{"error": message}``
+- INFO: metadata holds the health or stats dict
+"""
+
+import json
+import struct
+
+HEADER = struct.Struct("!BIII")
+
+# Request kinds
+RENDER = 0x01
+HEALTH = 0x02
+STATS = 0x03
+
+# Response kinds
+RESULT = 0x81
+ERROR = 0x82
+INFO = 0x83
+
+MAX_METADATA = 16 * 1024 * 1024
+MAX_PAYLOAD = 256 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """Malformed or oversized frame."""
+
+
+def encode_message(kind, request_id, metadata=None, payload=b""):
+    """Return the parts of a frame, ready for writelines()/sendall()."""
+    meta = b""
+    if metadata is not None:
+        meta = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    head = HEADER.pack(kind, request_id, len(meta), len(payload)) + meta
+    return [head, payload] if payload else [head]
+
+
+def parse_header(data):
+    """Unpack a header into (kind, request_id, metadata_len, payload_len)."""
+    kind, request_id, meta_len, payload_len = HEADER.unpack(data)
+    if meta_len > MAX_METADATA:
+        raise ProtocolError(f"Metadata too large: {meta_len} bytes")
+    if payload_len > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload too large: {payload_len} bytes")
+    return kind, request_id, meta_len, payload_len
+
+
+def decode_metadata(data):
+    """Decode a metadata block (empty means None)."""
+    if not data:
+        return None
+    try:
+        return json.loads(data)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"Invalid metadata: {e}") from e
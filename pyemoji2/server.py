@@ -0,0 +1,298 @@
+"""
+Long-lived local render server.
+
+Keeps the library, per-thread font maps and layout caches warm across
+requests. Jobs arrive over a Unix domain socket or localhost TCP using the
+framing in ``pyemoji2.protocol``; see ``pyemoji2.client.RenderClient``.
+
+Run with ``python -m pyemoji2.server --socket /tmp/pyemoji2.sock``.
+"""
+
+import argparse
+import asyncio
+import errno
+import os
+import socket
+import stat
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import protocol
+from .cache import RenderCache
+from .jobs import render_bytes, warm_worker
+
+
+class RenderServer:
+    """Render jobs from many connections on one warm worker pool.
+
+    At most max_concurrency renders run at once; further requests wait.
+    Each connection may pipeline up to max_pipeline requests before the
+    server stops reading from it. Health and stats requests skip the
+    render queue. An optional RenderCache answers exact repeats without
+    rendering.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        host="127.0.0.1",
+        port=0,
+        workers=None,
+        max_concurrency=None,
+        max_pipeline=64,
+        cache=None,
+    ):
+        self.path = path
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self.max_pipeline = max_pipeline
+        self.cache = cache
+        self._pool = None
+        self._server = None
+        self._limit = None
+        self._started = None
+        self._stats = {
+            "requests": 0,
+            "ok": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "queued": 0,
+            "connections": 0,
+            "render_s": 0.0,
+        }
+
+    @property
+    def address(self):
+        """Socket path, or (host, port) once a TCP server has started."""
+        if self.path:
+            return self.path
+        if self._server is not None:
+            return self._server.sockets[0].getsockname()[:2]
+        return (self.host, self.port)
+
+    async def start(self):
+        """Start listening."""
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="pyemoji2-server",
+            initializer=warm_worker,
+        )
+        self._limit = asyncio.Semaphore(self.max_concurrency)
+        if self.path:
+            _remove_stale_socket(self.path)
+            self._server = await asyncio.start_unix_server(self._handle, self.path)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle, self.host, self.port
+            )
+        self._started = time.monotonic()
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.path:
+                try:
+                    os.unlink(self.path)
+                except FileNotFoundError:
+                    pass
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self):
+        """Serve until interrupted."""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    def stats(self):
+        """Counters, throughput and uptime."""
+        stats = dict(self._stats)
+        done = stats["ok"] + stats["failed"]
+        stats["avg_render_ms"] = (
+            round(stats["render_s"] / done * 1000, 3) if done else 0.0
+        )
+        stats["render_s"] = round(stats["render_s"], 6)
+        stats["uptime_s"] = (
+            round(time.monotonic() - self._started, 3) if self._started else 0.0
+        )
+        stats["workers"] = self.workers
+        stats["max_concurrency"] = self.max_concurrency
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    async def _handle(self, reader, writer):
+        self._stats["connections"] += 1
+        write_lock = asyncio.Lock()
+        window = asyncio.Semaphore(self.max_pipeline)
+        tasks = set()
+
+        def finished(task):
+            tasks.discard(task)
+            window.release()
+
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(protocol.HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break  # Client closed the connection
+                kind, request_id, meta_len, payload_len = protocol.parse_header(header)
+                metadata = protocol.decode_metadata(await reader.readexactly(meta_len))
+                payload = await reader.readexactly(payload_len)
+
+                # Backpressure: stop reading while the pipeline is full
+                await window.acquire()
+                task = asyncio.ensure_future(
+                    self._dispatch(kind, request_id, metadata, payload, writer, write_lock)
+                )
+                tasks.add(task)
+                task.add_done_callback(finished)
+        except protocol.ProtocolError as e:
+            # Framing can't be recovered; report and drop the connection
+            await self._send(writer, write_lock, protocol.ERROR, 0, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._stats["connections"] -= 1
+
+    async def _dispatch(self, kind, request_id, metadata, payload, writer, write_lock):
+        try:
+            if kind == protocol.HEALTH:
+                response = (protocol.INFO, {"status": "ok"}, b"")
+            elif kind == protocol.STATS:
+                response = (protocol.INFO, self.stats(), b"")
+            elif kind == protocol.RENDER:
+                image = await self._render(metadata or {}, payload)
+                response = (protocol.RESULT, None, image)
+            else:
+                raise protocol.ProtocolError(f"Unknown request kind: {kind}")
+        except Exception as e:
+            response = (protocol.ERROR, {"error": str(e)}, b"")
+        await self._send(writer, write_lock, response[0], request_id, *response[1:])
+
+    async def _render(self, metadata, payload):
+        self._stats["requests"] += 1
+        self._stats["queued"] += 1
+        async with self._limit:
+            self._stats["queued"] -= 1
+            self._stats["in_flight"] += 1
+            start = time.perf_counter()
+            try:
+                image = await asyncio.get_running_loop().run_in_executor(
+                    self._pool,
+                    render_bytes,
+                    payload,
+                    metadata.get("ops", ()),
+                    metadata.get("size"),
+                    metadata.get("format", "png"),
+                    self.cache,
+                )
+            except Exception:
+                self._stats["failed"] += 1
+                raise
+            else:
+                self._stats["ok"] += 1
+                return image
+            finally:
+                self._stats["in_flight"] -= 1
+                self._stats["render_s"] += time.perf_counter() - start
+
+    async def _send(self, writer, write_lock, kind, request_id, metadata=None, payload=b""):
+        async with write_lock:
+            try:
+                writer.writelines(
+                    protocol.encode_message(kind, request_id, metadata, payload)
+                )
+                await writer.drain()
+            except ConnectionError:
+                pass  # Client went away; nothing to report to
+
+
+def _remove_stale_socket(path):
+    """Unlink a socket left behind by a server that is no longer running."""
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)  # Nobody is listening
+            return
+        except FileNotFoundError:
+            return
+    raise OSError(errno.EADDRINUSE, f"A server is already listening on {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pyemoji2.server",
+        description="Serve render jobs over a Unix socket or localhost TCP",
+    )
+    parser.add_argument("--socket", help="Unix domain socket path")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host")
+    parser.add_argument("--port", type=int, default=7878, help="TCP port")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="Number of worker threads (default: CPU count)",
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=None,
+        help="Renders allowed at once (default: workers)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse results of identical requests from this directory",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=256,
+        help="Maximum cache size in MiB (default: 256)",
+    )
+    args = parser.parse_args(argv)
+
+    cache = None
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+
+    server = RenderServer(
+        path=args.socket,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        cache=cache,
+    )
+    sys.stderr.write(f"pyemoji2 render server on {args.socket or (args.host, args.port)}\n")
+    server.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
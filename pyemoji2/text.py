@@ -2,11 +2,55 @@
 Advanced text classes for pyemoji2 with method chaining support.
 """
 
+import html
+from collections import namedtuple
+
+# Hashable description of how a text is drawn (everything but the string).
+# Fields follow the native EmojiTextStyle; disabled effects are normalized so
+# equal-looking styles compare equal and share one compiled native style.
+TextStyle = namedtuple(
+    "TextStyle",
+    [
+        "font",
+        "size",
+        "color",
+        "markup",
+        "shadow_offset",
+        "shadow_color",
+        "shadow_opacity",
+        "outline_color",
+        "outline_width",
+        "gradient_colors",
+        "gradient_vertical",
+        "background",
+        "padding",
+        "border_color",
+        "border_width",
+    ],
+)
+
 
 class Text:
     """Text with advanced styling support."""
 
-    def __init__(self, text, font=None, size=24):
+    kind = "text"
+
+    __slots__ = (
+        "text",
+        "font",
+        "size",
+        "color",
+        "markup",
+        "outline_color",
+        "outline_width",
+        "gradient_colors",
+        "gradient_vertical",
+        "shadow_offset",
+        "shadow_color",
+        "shadow_opacity",
+    )
+
+    def __init__(self, text, font=None, size=24, markup=False):
         if font is None:
             # Import here to avoid circular imports
             from .core import get_system_fonts
@@ -16,6 +60,7 @@ class Text:
         self.font = font
         self.size = size
         self.color = "black"
+        self.markup = markup  # text is Pango markup
 
         # Advanced properties
         self.outline_color = None
@@ -50,12 +95,103 @@ class Text:
         self.shadow_opacity = opacity
         return self
 
+    def style(self):
+        """Return the hashable TextStyle for all configured effects.
+
+        Effects are drawn together in order: shadow, outline, then gradient
+        or solid fill. Raises TypeError if the font or a color in use is not
+        a string, like the native bindings do.
+        """
+        has_shadow = bool(self.shadow_offset)
+        has_outline = bool(self.outline_color) and self.outline_width > 0
+        _check_str("font", self.font)
+        _check_str("color", self.color)
+        if has_shadow and self.shadow_color:
+            _check_str("shadow_color", self.shadow_color)
+        if has_outline:
+            _check_str("outline_color", self.outline_color)
+        if self.gradient_colors:
+            for color in self.gradient_colors:
+                _check_str("gradient color", color)
+        return TextStyle(
+            self.font,
+            self.size,
+            self.color,
+            bool(self.markup),
+            tuple(self.shadow_offset) if has_shadow else None,
+            (self.shadow_color or "gray") if has_shadow else None,
+            self.shadow_opacity if has_shadow else 0.0,
+            self.outline_color if has_outline else None,
+            self.outline_width if has_outline else 0,
+            tuple(self.gradient_colors) if self.gradient_colors else None,
+            bool(self.gradient_vertical) if self.gradient_colors else False,
+            None,
+            0,
+            None,
+            0,
+        )
+
+    @classmethod
+    def from_spans(cls, spans, font=None, size=24):
+        """Build rich text from (substring, style) runs.
+
+        style is None or a dict of Pango span attributes, e.g.
+        {"color": "red", "weight": "bold", "size": 32}. "color" is an alias
+        for "foreground" and "size" is in points. All runs are shaped and
+        drawn as one layout, so no manual positioning is needed.
+        """
+        parts = []
+        for substring, style in spans:
+            content = html.escape(substring, quote=False)
+            if style:
+                attrs = " ".join(
+                    f"{_SPAN_ALIASES.get(name, name)}={_span_value(name, value)}"
+                    for name, value in style.items()
+                )
+                content = f"<span {attrs}>{content}</span>"
+            parts.append(content)
+        return cls("".join(parts), font, size, markup=True)
+
+    def to_dict(self):
+        """Return a JSON-serializable description of this text."""
+        spec = {"type": self.kind}
+        for name in _slot_names(type(self)):
+            value = getattr(self, name)
+            spec[name] = list(value) if isinstance(value, tuple) else value
+        return spec
+
+    @classmethod
+    def from_dict(cls, spec):
+        """Build a Text or TextBox from a description made by to_dict()."""
+        spec = dict(spec)
+        kind = spec.pop("type", cls.kind)
+        target = _KINDS.get(kind)
+        if target is None:
+            raise ValueError(f"Unknown text type: {kind!r}")
+
+        if "text" not in spec:
+            raise ValueError(f"{kind} is missing 'text'")
+        obj = target(spec.pop("text"), spec.pop("font", None), spec.pop("size", 24))
+        # Only data attributes; methods and class attributes aren't properties
+        properties = set(_slot_names(target))
+        for name, value in spec.items():
+            if name not in properties:
+                raise ValueError(f"Unknown {kind} property: {name!r}")
+            if isinstance(value, list):
+                value = tuple(value)
+            setattr(obj, name, value)
+        return obj
+
 
 class TextBox(Text):
     """Text with background box."""
 
-    def __init__(self, text, font=None, size=24):
-        super().__init__(text, font, size)
+    kind = "textbox"
+
+    __slots__ = ("background", "padding", "border_color", "border_width")
+
+    def __init__(self, text, font=None, size=24, markup=False):
+        super().__init__(text, font, size, markup)
         self.background = None
         self.padding = 10
         self.border_color = None
@@ -72,3 +208,47 @@ class TextBox(Text):
         self.border_color = color
         self.border_width = width
         return self
+
+    def style(self):
+        """Return the hashable TextStyle, including the box."""
+        if self.background:
+            _check_str("background", self.background)
+        if self.border_width > 0 and self.border_color:
+            _check_str("border_color", self.border_color)
+        return super().style()._replace(
+            background=self.background or "white",
+            padding=self.padding,
+            border_color=(self.border_color or "black") if self.border_width > 0 else None,
+            border_width=self.border_width if self.border_width > 0 else 0,
+        )
+
+
+_SPAN_ALIASES = {"color": "foreground"}
+
+
+def _span_value(name, value):
+    """Quoted Pango span attribute value."""
+    if not name.replace("_", "").isalnum():
+        raise ValueError(f"Invalid span attribute: {name!r}")
+    if name == "size" and isinstance(value, (int, float)):
+        value = round(value * 1024)  # points to Pango units
+    elif name == "underline" and value is True:
+        value = "single"
+    elif isinstance(value, bool):
+        value = "true" if value else "false"
+    return '"' + html.escape(str(value)) + '"'
+
+
+def _check_str(name, value):
+    # The native side reads these as C strings; None would be a NULL pointer
+    if not isinstance(value, str):
+        raise TypeError(f"{name} must be str, not {type(value).__name__}")
+
+
+def _slot_names(cls):
+    """Attribute names declared in __slots__ along the class hierarchy."""
+    for klass in reversed(cls.__mro__):
+        yield from klass.__dict__.get("__slots__", ())
+
+
+_KINDS = {"text": Text, "textbox": TextBox}
@@ -0,0 +1,190 @@
+import struct
+import zlib
+
+import pytest
+
+from pyemoji2.animation import (
+    PNG_SIGNATURE,
+    Animation,
+    _delay,
+    _first_difference,
+    _last_difference,
+    changed_region,
+)
+
+WIDTH, HEIGHT = 4, 3
+
+
+class FakeImage:
+    width = WIDTH
+    height = HEIGHT
+
+    def copy(self):
+        return self
+
+    def close(self):
+        pass
+
+
+def blank():
+    return bytearray(WIDTH * HEIGHT * 4)
+
+
+def with_pixel(pixels, x, y, value=255, channel=0):
+    pixels = bytearray(pixels)
+    pixels[(y * WIDTH + x) * 4 + channel] = value
+    return bytes(pixels)
+
+
+def chunks(data):
+    assert data.startswith(PNG_SIGNATURE)
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        yield kind, body
+        pos += 12 + length
+
+
+def fctl(body):
+    return dict(
+        zip(
+            ("sequence", "w", "h", "x", "y", "delay_num", "delay_den", "dispose", "blend"),
+            struct.unpack(">IIIIIHHBB", body),
+        )
+    )
+
+
+def animation(frames):
+    anim = Animation(FakeImage())
+    anim._frames = [((), duration) for _, duration in frames]
+    anim.render_frames = lambda: iter([(bytes(p), d) for p, d in frames])
+    return anim
+
+
+# Difference search
+
+
+@pytest.mark.parametrize("index", [0, 1, 7, 14, 15])
+def test_first_and_last_difference(index):
+    a = bytes(16)
+    b = bytearray(a)
+    b[index] = 1
+    assert _first_difference(a, bytes(b)) == index
+    assert _last_difference(a, bytes(b)) == index
+
+
+def test_difference_at_both_edges():
+    a = bytes(16)
+    b = bytearray(a)
+    b[0] = b[15] = 1
+    assert _first_difference(a, bytes(b)) == 0
+    assert _last_difference(a, bytes(b)) == 15
+
+
+def test_changed_region_identical():
+    assert changed_region(bytes(blank()), bytes(blank()), WIDTH, HEIGHT) is None
+
+
+@pytest.mark.parametrize(
+    "x, y",
+    [(0, 0), (WIDTH - 1, 0), (0, 1), (WIDTH - 1, 1), (WIDTH - 1, HEIGHT - 1)],
+)
+def test_changed_region_single_pixel(x, y):
+    # First and last byte of a row: channel 0 of x=0, channel 3 of the last x
+    channel = 3 if x == WIDTH - 1 else 0
+    current = with_pixel(blank(), x, y, channel=channel)
+    assert changed_region(bytes(blank()), current, WIDTH, HEIGHT) == (x, y, 1, 1)
+
+
+def test_changed_region_spans_rows():
+    current = with_pixel(with_pixel(blank(), 2, 0), 0, 2, channel=3)
+    assert changed_region(bytes(blank()), current, WIDTH, HEIGHT) == (0, 0, 3, 3)
+
+
+def test_changed_region_skips_unchanged_middle_row():
+    current = with_pixel(with_pixel(blank(), 3, 0), 1, 2)
+    assert changed_region(bytes(blank()), current, WIDTH, HEIGHT) == (1, 0, 3, 3)
+
+
+# Delays
+
+
+def test_delay_in_milliseconds():
+    assert _delay(100) == (100, 1000)
+    assert _delay(0xFFFF) == (0xFFFF, 1000)
+
+
+def test_delay_above_u16_switches_to_centiseconds():
+    assert _delay(0x10000) == (6554, 100)
+    assert _delay(120000) == (12000, 100)
+    assert _delay(10_000_000) == (0xFFFF, 100)
+
+
+# Encoding
+
+
+def test_to_bytes_merges_identical_frames_and_numbers_chunks():
+    a = bytes(blank())
+    b = with_pixel(a, 1, 1)
+    c = with_pixel(b, 3, 2)
+    data = animation(
+        [(a, 100), (a, 50), (b, 100), (b, 70), (c, 0x10000)]
+    ).to_bytes()
+    parsed = list(chunks(data))
+    kinds = [kind for kind, _ in parsed]
+    assert kinds == [
+        b"IHDR", b"acTL",
+        b"fcTL", b"IDAT",
+        b"fcTL", b"fdAT",
+        b"fcTL", b"fdAT",
+        b"IEND",
+    ]
+
+    assert struct.unpack(">II", parsed[1][1]) == (3, 0)  # frames, loops
+
+    controls = [fctl(body) for kind, body in parsed if kind == b"fcTL"]
+    data_sequences = [
+        struct.unpack(">I", body[:4])[0] for kind, body in parsed if kind == b"fdAT"
+    ]
+    assert [c["sequence"] for c in controls] == [0, 1, 3]
+    assert data_sequences == [2, 4]
+
+    # Merged frames add up their durations
+    assert (controls[0]["delay_num"], controls[0]["delay_den"]) == (150, 1000)
+    assert (controls[1]["delay_num"], controls[1]["delay_den"]) == (170, 1000)
+    assert (controls[2]["delay_num"], controls[2]["delay_den"]) == _delay(0x10000)
+
+    # First frame is full size, later ones only the changed pixel
+    assert [(c["x"], c["y"], c["w"], c["h"]) for c in controls] == [
+        (0, 0, WIDTH, HEIGHT),
+        (1, 1, 1, 1),
+        (3, 2, 1, 1),
+    ]
+
+
+def test_to_bytes_region_pixels():
+    a = bytes(blank())
+    b = with_pixel(with_pixel(a, 1, 1, 200), 2, 1, 100, channel=3)
+    parsed = list(chunks(animation([(a, 100), (b, 100)]).to_bytes()))
+    (fdat,) = [body for kind, body in parsed if kind == b"fdAT"]
+    rows = zlib.decompress(fdat[4:])
+    assert rows == b"\x00" + b[(WIDTH + 1) * 4 : (WIDTH + 3) * 4]
+
+
+def test_single_frame_has_no_fdat():
+    parsed = list(chunks(animation([(bytes(blank()), 100)]).to_bytes()))
+    assert [kind for kind, _ in parsed] == [b"IHDR", b"acTL", b"fcTL", b"IDAT", b"IEND"]
+
+
+def test_no_frames():
+    with pytest.raises(ValueError):
+        Animation(FakeImage()).to_bytes()
+
+
+def test_invalid_duration():
+    with pytest.raises(ValueError):
+        Animation(FakeImage()).frame(duration=0)
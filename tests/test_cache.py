@@ -0,0 +1,55 @@
+import os
+import threading
+
+from pyemoji2.cache import RenderCache
+
+
+def test_put_and_get(tmp_path):
+    cache = RenderCache(tmp_path)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, b"data")
+    assert cache.get("ab" * 32) == b"data"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert stats["bytes"] == 4
+
+
+def test_overwrite_does_not_inflate_size(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.put("ab" * 32, b"12345678")
+    cache.put("ab" * 32, b"1234")
+    assert cache.stats()["bytes"] == 4
+    assert RenderCache(tmp_path).stats()["bytes"] == 4
+
+
+def test_concurrent_puts_of_one_key(tmp_path):
+    cache = RenderCache(tmp_path)
+    threads = [
+        threading.Thread(target=cache.put, args=("cd" * 32, b"x" * 100))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.stats()["bytes"] == 100
+
+
+def test_eviction_goes_down_to_low_water(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=1000, low_water=0.5)
+    for i in range(10):
+        cache.put(f"{i:064x}", b"x" * 100)
+        os.utime(cache._path(f"{i:064x}"), (i, i))  # Oldest first
+    assert cache.stats()["evictions"] == 0
+
+    cache.put(f"{10:064x}", b"x" * 100)
+    stats = cache.stats()
+    assert stats["bytes"] <= 500
+    assert stats["evictions"] == 6
+    # The newest entry survives, the oldest is gone
+    assert cache.get(f"{10:064x}") is not None
+    assert cache.get(f"{0:064x}") is None
+
+    # Room was made, so the next stores don't rescan
+    cache.put(f"{11:064x}", b"x" * 100)
+    assert cache.stats()["evictions"] == 6
@@ -0,0 +1,152 @@
+import pytest
+
+from pyemoji2 import Image, Text, TextBox
+from pyemoji2.display_list import DisplayList
+
+
+class FakeImage:
+    """Stands in for Image: text is 10px per character and 20px tall."""
+
+    width = 200
+    height = 100
+
+    def __init__(self):
+        self.live = set()
+        self.shaped = 0
+        self.batches = []
+
+    def _shape(self, text_obj, style, x, y):
+        self.shaped += 1
+        layout = self.shaped
+        self.live.add(layout)
+        w = 10 * len(text_obj.text)
+        ink = (x - 1, y - 1, x + w + 1, y + 21) if w else (x, y, x, y)
+        cover = None
+        if style.background:
+            p = style.padding
+            cover = (x - p, y - p, x + w + p, y + 20 + p)
+        return layout, ink, cover
+
+    def _draw_layouts(self, style, layouts, positions):
+        assert all(layout in self.live for layout in layouts)
+        self.batches.append((style.color, list(positions)))
+
+    def _release_layout(self, layout):
+        self.live.remove(layout)
+
+
+def colored(text, color):
+    return Text(text, font="Sans").with_color(color)
+
+
+def test_same_style_ops_are_coalesced():
+    dl = DisplayList()
+    dl.record(colored("a", "red"), (0, 0))
+    dl.record(colored("b", "blue"), (50, 0))
+    dl.record(colored("c", "red"), (100, 0))
+    img = FakeImage()
+    assert dl.execute(img) == {"ops": 3, "drawn": 3, "batches": 2}
+    assert img.batches == [("red", [(0, 0), (100, 0)]), ("blue", [(50, 0)])]
+    assert len(dl) == 0
+
+
+def test_overlapping_ops_keep_paint_order():
+    dl = DisplayList()
+    dl.record(colored("a", "red"), (0, 0))
+    dl.record(colored("bb", "blue"), (5, 5))
+    dl.record(colored("c", "red"), (10, 10))  # Overlaps b, must stay above it
+    img = FakeImage()
+    dl.execute(img)
+    assert [color for color, _ in img.batches] == ["red", "blue", "red"]
+
+
+def test_off_canvas_empty_and_covered_ops_are_skipped():
+    dl = DisplayList()
+    dl.record(colored("off", "red"), (500, 0))
+    dl.record(colored("", "red"), (10, 10))
+    dl.record(colored("hidden", "red"), (20, 50))
+    dl.record(TextBox("a wide box", font="Sans").with_background("white", 10), (10, 45))
+    img = FakeImage()
+    assert dl.execute(img)["drawn"] == 1
+    assert img.batches == [("black", [(10, 45)])]
+
+
+def test_each_op_is_shaped_once_and_released():
+    dl = DisplayList()
+    for i in range(100):
+        dl.record(colored(str(i), "red" if i % 2 else "blue"), (i, i % 80))
+    img = FakeImage()
+    dl.execute(img)
+    assert img.shaped == 100
+    assert img.live == set()
+
+
+def test_plan_does_not_clear():
+    dl = DisplayList([(colored("a", "red"), (0, 0))])
+    img = FakeImage()
+    assert [style.color for style, _ in dl.plan(img)] == ["red"]
+    assert img.live == set()
+    assert len(dl) == 1
+
+
+def test_record_snapshots_text():
+    text = colored("a", "red")
+    dl = DisplayList().record(text, (1, 2))
+    text.with_color("blue")
+    assert dl.ops[0][0].color == "red"
+
+
+def test_json_round_trip():
+    dl = DisplayList()
+    dl.record(colored("Hi 👋", "red").with_outline("black", 2), (1, 2))
+    dl.record(TextBox("Box", font="Sans").with_border("blue", 3), (10, 20))
+    loaded = DisplayList.from_json(dl.to_json())
+    assert loaded.to_ops() == dl.to_ops()
+    assert type(loaded.ops[1][0]) is TextBox
+
+
+def test_from_json_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        DisplayList.from_json('{"version": 99, "ops": []}')
+
+
+# Real rendering
+
+
+def interleaved_ops():
+    ops = []
+    for i in range(40):
+        color = ("red", "blue", "green")[i % 3]
+        ops.append((Text(f"word {i} 👋", size=14).with_color(color), (5 + 9 * i, 4 * i)))
+    ops.append((TextBox("box", size=14).with_background("yellow", 6), (30, 30)))
+    ops.append((Text("outline", size=18).with_outline("black", 1), (20, 40)))
+    return ops
+
+
+def test_deferred_matches_immediate():
+    with Image.create_empty(400, 200) as immediate:
+        for text_obj, position in interleaved_ops():
+            immediate.add(text_obj, position)
+        expected = immediate.to_rgba()
+
+    with Image.create_empty(400, 200).defer() as deferred:
+        for text_obj, position in interleaved_ops():
+            deferred.add(text_obj, position)
+        assert len(deferred.display_list) == len(interleaved_ops())
+        assert deferred.to_rgba() == expected
+        assert len(deferred.display_list) == 0
+
+
+def test_replay_matches_execute():
+    dl = DisplayList(interleaved_ops())
+    with Image.create_empty(400, 200) as a, Image.create_empty(400, 200) as b:
+        dl.replay(a)
+        dl.execute(b)
+        assert a.to_rgba() == b.to_rgba()
+
+
+def test_invalid_markup_raises_on_export():
+    with Image.create_empty(50, 50).defer() as img:
+        img.add(Text("<b>unclosed", markup=True), (0, 0))
+        with pytest.raises(ValueError):
+            img.to_bytes()
@@ -0,0 +1,183 @@
+import io
+import json
+
+import pytest
+
+from pyemoji2 import Text, TextBox
+from pyemoji2.cli import main, read_jobs
+from pyemoji2.jobs import InvalidJob, JobRunner, dump_op, load_op
+
+
+def job(tmp_path, i, **extra):
+    spec = {
+        "id": i,
+        "size": [16, 16],
+        "ops": [{"type": "text", "text": str(i), "position": [1, 1], "size": 8}],
+        "output": str(tmp_path / f"out{i}.png"),
+    }
+    spec.update(extra)
+    return spec
+
+
+# Op descriptions
+
+
+def test_op_round_trip():
+    text = TextBox("Hi", font="Sans", size=12).with_background("red", 4)
+    loaded, position = load_op(dump_op(text, (3, 4)))
+    assert type(loaded) is TextBox
+    assert position == (3, 4)
+    assert loaded.style() == text.style()
+
+
+@pytest.mark.parametrize("name", ["style", "with_color", "kind", "to_dict", "nope"])
+def test_from_dict_rejects_non_properties(name):
+    with pytest.raises(ValueError, match="Unknown text property"):
+        Text.from_dict({"type": "text", "text": "x", "font": "Sans", name: 1})
+
+
+def test_from_dict_rejects_box_properties_on_text():
+    with pytest.raises(ValueError):
+        Text.from_dict({"type": "text", "text": "x", "font": "Sans", "padding": 3})
+
+
+def test_from_dict_requires_text():
+    with pytest.raises(ValueError, match="missing 'text'"):
+        Text.from_dict({"type": "text", "font": "Sans"})
+
+
+def test_load_op_requires_position():
+    with pytest.raises(ValueError, match="position"):
+        load_op({"type": "text", "text": "x"})
+
+
+# JobRunner
+
+
+def test_ordered_results_follow_input_order(tmp_path):
+    jobs = [job(tmp_path, i) for i in range(20)]
+    with JobRunner(workers=4) as runner:
+        results = list(runner.run(jobs))
+    assert [r["id"] for r in results] == list(range(20))
+    assert all(r["status"] == "ok" for r in results)
+    assert all((tmp_path / f"out{i}.png").exists() for i in range(20))
+    assert runner.stats["jobs"] == 20
+    assert runner.stats["ok"] == 20
+
+
+def test_unordered_returns_every_result(tmp_path):
+    jobs = [job(tmp_path, i) for i in range(20)]
+    with JobRunner(workers=4, ordered=False) as runner:
+        results = list(runner.run(jobs))
+    assert sorted(r["id"] for r in results) == list(range(20))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_max_pending_limits_jobs_read_ahead(tmp_path, ordered):
+    pulled = 0
+    results = []
+
+    def jobs():
+        nonlocal pulled
+        for i in range(30):
+            pulled += 1
+            yield job(tmp_path, i)
+
+    with JobRunner(workers=2, ordered=ordered, max_pending=3) as runner:
+        for result in runner.run(jobs()):
+            # The job just read may not be submitted yet, hence + 1
+            assert pulled - len(results) <= 3 + 1
+            results.append(result)
+    assert len(results) == 30
+
+
+def test_invalid_jobs_are_reported_in_place(tmp_path):
+    jobs = [
+        job(tmp_path, 0),
+        InvalidJob("Invalid JSON: boom", job_id="line 2"),
+        job(tmp_path, 2, output=str(tmp_path / "x.gif")),
+        {"id": 3, "size": [4, 4]},
+        job(tmp_path, 4, ops=[{"type": "text", "text": "no position"}]),
+        job(tmp_path, 5),
+    ]
+    with JobRunner(workers=2) as runner:
+        results = list(runner.run(jobs))
+    assert [r["id"] for r in results] == [0, "line 2", 2, 3, 4, 5]
+    assert [r["status"] for r in results] == [
+        "ok", "error", "error", "error", "error", "ok"
+    ]
+    assert results[1]["error"] == "Invalid JSON: boom"
+    assert "Unsupported output format" in results[2]["error"]
+    assert "output" in results[3]["error"]
+    assert runner.stats["failed"] == 4
+
+
+def test_corrupt_input_is_an_error(tmp_path):
+    bad = tmp_path / "bad.png"
+    bad.write_bytes(b"not a png")
+    with JobRunner(workers=1) as runner:
+        (result,) = runner.run([job(tmp_path, 0, input=str(bad), size=None)])
+    assert result["status"] == "error"
+    assert not (tmp_path / "out0.png").exists()
+
+
+def test_run_requires_context_manager():
+    with pytest.raises(RuntimeError):
+        list(JobRunner(workers=1).run([]))
+
+
+# CLI
+
+
+def test_read_jobs():
+    stream = io.StringIO('{"size": [1, 1]}\n\n{bad\n[1, 2]\n{"id": "x"}\n')
+    jobs = list(read_jobs(stream))
+    assert jobs[0] == {"size": [1, 1], "id": 1}
+    assert isinstance(jobs[1], InvalidJob) and jobs[1].job_id == "line 3"
+    assert isinstance(jobs[2], InvalidJob) and jobs[2].job_id == "line 4"
+    assert jobs[3] == {"id": "x"}
+
+
+def run_cli(tmp_path, capsys, lines, *args):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    code = main(["-i", str(path), *args])
+    out, err = capsys.readouterr()
+    return code, [json.loads(line) for line in out.splitlines()], err
+
+
+def test_cli_success(tmp_path, capsys):
+    lines = [json.dumps(job(tmp_path, i)) for i in range(5)]
+    code, results, err = run_cli(tmp_path, capsys, lines, "-j", "2")
+    assert code == 0
+    assert [r["id"] for r in results] == list(range(5))
+    summary = json.loads(err)
+    assert summary["jobs"] == 5
+    assert summary["failed"] == 0
+
+
+def test_cli_failure_exit_code(tmp_path, capsys):
+    lines = [json.dumps(job(tmp_path, 0)), "{bad", json.dumps(job(tmp_path, 2))]
+    code, results, _ = run_cli(tmp_path, capsys, lines, "--no-summary")
+    assert code == 1
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[1]["id"] == "line 2"
+
+
+def test_cli_unordered(tmp_path, capsys):
+    lines = [json.dumps(job(tmp_path, i)) for i in range(10)]
+    code, results, err = run_cli(tmp_path, capsys, lines, "--unordered", "--no-summary")
+    assert code == 0
+    assert sorted(r["id"] for r in results) == list(range(10))
+    assert err == ""
+
+
+def test_cli_cache(tmp_path, capsys):
+    lines = [json.dumps(job(tmp_path, 0)), json.dumps(job(tmp_path, 0, id=1))]
+    cache_dir = str(tmp_path / "cache")
+    code, results, err = run_cli(
+        tmp_path, capsys, lines, "-j", "1", "--cache-dir", cache_dir
+    )
+    assert code == 0
+    assert [r["cached"] for r in results] == [False, True]
+    assert json.loads(err)["cache"]["hits"] == 1
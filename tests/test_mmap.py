@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from pyemoji2 import Image, Text
+
+WIDTH, HEIGHT = 64, 32
+
+
+def draw(img):
+    img.add(Text("Hi 👋", size=18).with_color("red"), (2, 2))
+
+
+def test_create_mmap_writes_into_file(tmp_path):
+    path = tmp_path / "frame.bgra"
+    with Image.create_mmap(str(path), WIDTH, HEIGHT) as img:
+        assert path.stat().st_size == WIDTH * HEIGHT * 4
+        draw(img)
+        img.flush()
+        assert any(path.read_bytes())
+
+
+def test_from_mmap_draws_in_place(tmp_path):
+    path = tmp_path / "frame.bgra"
+    path.write_bytes(bytes(WIDTH * HEIGHT * 4))
+    with Image.from_mmap(str(path), WIDTH, HEIGHT) as img:
+        draw(img)
+        img.flush()
+    assert any(path.read_bytes())
+
+
+def test_copy_on_write_leaves_read_only_file_untouched(tmp_path):
+    path = tmp_path / "frame.bgra"
+    original = bytes(range(256)) * (WIDTH * HEIGHT * 4 // 256)
+    path.write_bytes(original)
+    os.chmod(path, 0o444)
+    try:
+        with Image.from_mmap(str(path), WIDTH, HEIGHT, write_through=False) as img:
+            draw(img)
+            img.flush()
+            png = img.to_bytes()
+        assert path.read_bytes() == original
+        with Image.from_bytes(png) as drawn:
+            assert (drawn.width, drawn.height) == (WIDTH, HEIGHT)
+    finally:
+        os.chmod(path, 0o644)
+
+
+def test_stride_padding(tmp_path):
+    path = tmp_path / "frame.bgra"
+    stride = WIDTH * 4 + 16
+    with Image.create_mmap(str(path), WIDTH, HEIGHT, stride=stride) as img:
+        assert path.stat().st_size == stride * HEIGHT
+        assert img.width == WIDTH
+
+
+def test_undersized_file(tmp_path):
+    path = tmp_path / "small.bgra"
+    path.write_bytes(bytes(WIDTH * HEIGHT * 4 - 1))
+    with pytest.raises(ValueError, match="smaller"):
+        Image.from_mmap(str(path), WIDTH, HEIGHT)
+
+
+@pytest.mark.parametrize("stride", [WIDTH * 4 - 4, WIDTH * 4 + 2])
+def test_bad_stride(tmp_path, stride):
+    with pytest.raises(ValueError, match="stride"):
+        Image.create_mmap(str(tmp_path / "f.bgra"), WIDTH, HEIGHT, stride=stride)
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="format"):
+        Image.create_mmap(str(tmp_path / "f.bgra"), WIDTH, HEIGHT, format="RGB")
+
+
+def test_close_unmaps(tmp_path):
+    path = tmp_path / "frame.bgra"
+    img = Image.create_mmap(str(path), WIDTH, HEIGHT)
+    mapping = img._mmap
+    draw(img)
+    img.close()
+    assert mapping.closed
+    assert img._mmap is None
+    with pytest.raises(RuntimeError):
+        img.flush()
+    # The file can be replaced once unmapped
+    os.replace(path, tmp_path / "moved.bgra")
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from pyemoji2 import Image, Text, protocol
+from pyemoji2.client import RenderClient, RenderError
+from pyemoji2.server import RenderServer
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A RenderServer on a Unix socket, served from a background event loop."""
+    srv = RenderServer(path=str(tmp_path / "s.sock"), workers=2)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(srv.start(), loop).result(timeout=10)
+    try:
+        yield srv
+    finally:
+        asyncio.run_coroutine_threadsafe(srv.close(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+
+@pytest.fixture
+def client(server):
+    with RenderClient(server.path, timeout=30) as c:
+        yield c
+
+
+def read_message(sock):
+    def read(size):
+        buf = b""
+        while len(buf) < size:
+            chunk = sock.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError("closed")
+            buf += chunk
+        return buf
+
+    kind, request_id, meta_len, payload_len = protocol.parse_header(
+        read(protocol.HEADER.size)
+    )
+    metadata = protocol.decode_metadata(read(meta_len))
+    return kind, request_id, metadata, read(payload_len)
+
+
+# Framing
+
+
+def test_encode_message_round_trip():
+    parts = protocol.encode_message(protocol.RENDER, 7, {"size": [4, 3]}, b"payload")
+    data = b"".join(parts)
+    head = data[: protocol.HEADER.size]
+    kind, request_id, meta_len, payload_len = protocol.parse_header(head)
+    assert (kind, request_id, payload_len) == (protocol.RENDER, 7, 7)
+    meta = data[protocol.HEADER.size : protocol.HEADER.size + meta_len]
+    assert protocol.decode_metadata(meta) == {"size": [4, 3]}
+    assert data[protocol.HEADER.size + meta_len :] == b"payload"
+
+
+def test_encode_message_without_payload_is_one_part():
+    parts = protocol.encode_message(protocol.HEALTH, 1)
+    assert len(parts) == 1
+    assert protocol.parse_header(parts[0]) == (protocol.HEALTH, 1, 0, 0)
+
+
+def test_parse_header_rejects_oversized_frames():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.parse_header(
+            protocol.HEADER.pack(protocol.RENDER, 1, protocol.MAX_METADATA + 1, 0)
+        )
+    with pytest.raises(protocol.ProtocolError):
+        protocol.parse_header(
+            protocol.HEADER.pack(protocol.RENDER, 1, 0, protocol.MAX_PAYLOAD + 1)
+        )
+
+
+def test_decode_metadata():
+    assert protocol.decode_metadata(b"") is None
+    assert protocol.decode_metadata(json.dumps({"a": 1}).encode()) == {"a": 1}
+    with pytest.raises(protocol.ProtocolError):
+        protocol.decode_metadata(b"{not json")
+
+
+# Server and client
+
+
+def test_render_blank_canvas(client):
+    data = client.render(size=(64, 32), ops=[(Text("Hi 👋", size=12), (2, 2))])
+    assert data.startswith(PNG_SIGNATURE)
+    with Image.from_bytes(data) as img:
+        assert (img.width, img.height) == (64, 32)
+
+
+def test_render_many_pipelines_and_matches_ids(client):
+    sizes = [(8 + i, 4 + i) for i in range(12)]
+    jobs = [
+        {"size": size, "ops": [(Text(str(i), size=8), (0, 0))]}
+        for i, size in enumerate(sizes)
+    ]
+    results = client.render_many(jobs, window=4)
+    assert len(results) == len(sizes)
+    for data, size in zip(results, sizes):
+        with Image.from_bytes(data) as img:
+            assert (img.width, img.height) == size
+
+
+def test_results_collected_out_of_order(client):
+    first = client.submit(size=(10, 10))
+    second = client.submit(size=(20, 20))
+    with Image.from_bytes(client.result(second)) as img:
+        assert img.width == 20
+    with Image.from_bytes(client.result(first)) as img:
+        assert img.width == 10
+
+
+def test_health_and_stats(client):
+    assert client.health() == {"status": "ok"}
+    client.render(size=(8, 8))
+    with pytest.raises(RenderError):
+        client.render(size=(8, 8), ops=[{"type": "text", "text": "no position"}])
+
+    stats = client.stats()
+    assert stats["requests"] == 2
+    assert stats["ok"] == 1
+    assert stats["failed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["connections"] == 1
+
+
+def test_bad_op_gets_error_reply(client):
+    with pytest.raises(RenderError, match="position"):
+        client.render(size=(8, 8), ops=[{"type": "text", "text": "x"}])
+    # The connection stays usable
+    assert client.render(size=(8, 8)).startswith(PNG_SIGNATURE)
+
+
+def test_bad_base_image_gets_error_reply(client):
+    with pytest.raises(RenderError):
+        client.render(base=b"not a png")
+
+
+def test_malformed_header_gets_connection_error(server):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(server.path)
+        sock.sendall(
+            protocol.HEADER.pack(protocol.RENDER, 5, protocol.MAX_METADATA + 1, 0)
+        )
+        kind, request_id, metadata, _ = read_message(sock)
+        assert kind == protocol.ERROR
+        assert request_id == 0
+        assert "too large" in metadata["error"]
+        assert sock.recv(1) == b""  # Server closed the connection
+
+
+def test_malformed_header_raises_in_client(server):
+    with RenderClient(server.path, timeout=10) as c:
+        c._sock.sendall(
+            protocol.HEADER.pack(protocol.RENDER, 1, protocol.MAX_METADATA + 1, 0)
+        )
+        with pytest.raises(RenderError, match="too large"):
+            c.result(1)
+
+
+def test_second_server_on_live_socket_fails(server):
+    other = RenderServer(path=server.path, workers=1)
+    with pytest.raises(OSError, match="already listening"):
+        asyncio.run(other.start())
+    asyncio.run(other.close())
+    with RenderClient(server.path, timeout=10) as c:
+        assert c.health()["status"] == "ok"
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # Leaves the file behind with nobody listening
+
+    async def start_and_close():
+        srv = await RenderServer(path=path, workers=1).start()
+        await srv.close()
+
+    asyncio.run(start_and_close())
@@ -0,0 +1,39 @@
+import pytest
+
+from pyemoji2 import Text, TextBox
+
+
+def test_equal_styles_compare_equal():
+    a = Text("a", font="Sans").with_outline("red", 0)
+    b = Text("b", font="Sans")
+    assert a.style() == b.style()
+    assert hash(a.style()) == hash(b.style())
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        Text("x", font="Sans").with_color(None),
+        Text("x", font="Sans").with_color(3),
+        Text("x", font="Sans").with_gradient(None, "red"),
+        Text("x", font="Sans").with_outline(5, 2),
+        TextBox("x", font="Sans").with_background(1),
+    ],
+)
+def test_style_rejects_non_string_colors(text):
+    with pytest.raises(TypeError, match="must be str"):
+        text.style()
+
+
+def test_style_rejects_missing_font():
+    text = Text("x", font="Sans")
+    text.font = None
+    with pytest.raises(TypeError, match="font must be str"):
+        text.style()
+
+
+def test_unused_colors_are_not_checked():
+    text = Text("x", font="Sans").with_outline(None)
+    assert text.style().outline_color is None
+    box = TextBox("x", font="Sans").with_border(None, 0)
+    assert box.style().border_color is None